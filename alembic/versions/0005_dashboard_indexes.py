@@ -0,0 +1,42 @@
+"""Index the dashboard's recent-review, insights and widget-list queries."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_dashboard_indexes"
+down_revision = "0004_timescale_pgvector"
+branch_labels = None
+depends_on = None
+
+
+def _index_names(connection, table: str) -> set[str]:
+    return {index["name"] for index in sa.inspect(connection).get_indexes(table)}
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    # Created even when TimescaleDB already indexes the hypertable on date, so
+    # the schema always matches the Review model and autogenerate stays quiet.
+    op.create_index("ix_reviews_date", "reviews", ["date"], unique=False)
+    op.create_index(
+        "ix_reviews_insights_date",
+        "reviews",
+        ["date"],
+        unique=False,
+        postgresql_where=sa.text("insights IS NOT NULL"),
+        sqlite_where=sa.text("insights IS NOT NULL"),
+    )
+
+    op.create_index("ix_widgets_owner_id_id", "widgets", ["owner_id", "id"], unique=False)
+    # The composite index covers owner_id lookups on its own.
+    if "ix_widgets_owner_id" in _index_names(connection, "widgets"):
+        op.drop_index("ix_widgets_owner_id", table_name="widgets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_widgets_owner_id", "widgets", ["owner_id"], unique=False)
+    op.drop_index("ix_widgets_owner_id_id", table_name="widgets")
+
+    op.drop_index("ix_reviews_insights_date", table_name="reviews")
+    op.drop_index("ix_reviews_date", table_name="reviews")
@@ -3,11 +3,12 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.user import User
+from app.services import auth_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
@@ -30,6 +31,13 @@ def _credential_exception() -> HTTPException:
 
 
 def get_user_from_token(token: str, db: Session) -> User:
+    cached = auth_cache.get(token)
+    if cached is not None:
+        # Attach a fresh instance to this session without re-selecting the row.
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
     credentials_exception = _credential_exception()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -41,6 +49,7 @@ def get_user_from_token(token: str, db: Session) -> User:
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise credentials_exception
+    auth_cache.put(token, {"id": user.id, "email": user.email}, payload.get("exp"))
     return user
 
 
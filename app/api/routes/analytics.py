@@ -77,8 +77,9 @@ def analytics_overview(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    total_reviews = db.query(func.count(Review.id)).scalar() or 0
-    avg_sentiment = db.query(func.avg(Review.sentiment_score)).scalar() or 0
+    total_reviews, avg_sentiment = db.query(
+        func.count(Review.id), func.avg(Review.sentiment_score)
+    ).one()
     latest_reviews = (
         db.query(Review)
         .filter(Review.sentiment_summary.isnot(None))
@@ -92,8 +93,8 @@ def analytics_overview(
             for highlight in review.insights.get("highlights", [])[:2]:
                 highlights.append(highlight)
     return {
-        "total_reviews": int(total_reviews),
-        "average_sentiment": float(avg_sentiment),
+        "total_reviews": int(total_reviews or 0),
+        "average_sentiment": float(avg_sentiment or 0),
         "metrics": {key: definition.label for key, definition in METRIC_MAP.items()},
         "highlights": highlights,
     }
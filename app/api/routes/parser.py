@@ -24,6 +24,7 @@ async def run_parser_job(job: ParseJobRequest, user=Depends(get_current_user)):
                 output_filename=job.output_filename,
                 finger_print=job.finger_print,
                 delay_range=(job.min_delay, job.max_delay),
+                include_rows=job.include_rows,
             )
         elif job.source is ParserSource.BANKI_RU:
             result = await parser_service.parse_banki_ru_reviews(
@@ -33,6 +34,7 @@ async def run_parser_job(job: ParseJobRequest, user=Depends(get_current_user)):
                 output_filename=job.output_filename,
                 finger_print=job.finger_print,
                 delay_range=(job.min_delay, job.max_delay),
+                include_rows=job.include_rows,
             )
         else:
             raise ParserServiceError(f"Unsupported parser source: {job.source}")
@@ -1,10 +1,8 @@
-import csv
-import io
-import json
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -14,6 +12,7 @@ from app.models.review import Review
 from app.schemas.review import ReviewOut
 from app.services.clustering import fake_cluster
 from app.services.reviews import import_reviews_async
+from app.services.uploads import UnsupportedUploadError, parse_review_upload
 from app.realtime import broadcast_refresh
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
@@ -25,18 +24,11 @@ async def upload_reviews(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    contents = await file.read()
-    records = []
-    if file.filename.endswith(".json"):
-        data = json.loads(contents)
-        if isinstance(data, dict):
-            data = [data]
-        records = list(data)
-    elif file.filename.endswith(".csv"):
-        reader = csv.DictReader(io.StringIO(contents.decode()))
-        records = list(reader)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
+    try:
+        # The spooled upload may live on disk; parse it off the event loop.
+        records = await run_in_threadpool(parse_review_upload, file.filename, file.file)
+    except UnsupportedUploadError as exc:
+        raise HTTPException(status_code=400, detail="Unsupported file type") from exc
 
     reviews = await import_reviews_async(db, records)
     await broadcast_refresh()
@@ -9,6 +9,7 @@ from app.schemas.widget import WidgetCreate, WidgetOut
 from app.services.widgets import (
     METRIC_MAP,
     compute_widget_value,
+    compute_widget_values,
     timeseries_for_metric,
 )
 
@@ -26,19 +27,17 @@ def list_widgets(
         .all()
     )
 
-    response: List[WidgetOut] = []
-    for widget in widgets:
-        value = compute_widget_value(widget, db)
-        response.append(
-            WidgetOut(
-                id=widget.id,
-                title=widget.title,
-                metric=widget.metric,
-                value=value,
-                visualization=widget.visualization,
-            )
+    values = compute_widget_values(widgets, db)
+    return [
+        WidgetOut(
+            id=widget.id,
+            title=widget.title,
+            metric=widget.metric,
+            value=values[widget.id],
+            visualization=widget.visualization,
         )
-    return response
+        for widget in widgets
+    ]
 
 
 @router.post("/", response_model=WidgetOut, status_code=status.HTTP_201_CREATED)
@@ -47,8 +46,6 @@ def create_widget(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    if payload.metric not in METRIC_MAP:
-        raise HTTPException(status_code=400, detail="Unsupported metric")
     widget = Widget(
         title=payload.title,
         metric=payload.metric,
@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "secret"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 60
     FOUNDATION_API_KEY: str | None = None
     FOUNDATION_API_BASE_URL: str = "https://foundation-models.api.cloud.ru/v1"
     FOUNDATION_CHAT_MODEL: str = "deepseek-ai/DeepSeek-R1-Distill-Llama-70B"
@@ -17,6 +18,12 @@ class Settings(BaseSettings):
     FOUNDATION_CHAT_CONCURRENCY: int = 3
     FOUNDATION_EMBEDDING_CONCURRENCY: int = 5
     FOUNDATION_EMBEDDING_DIMENSION: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+
+    PARSER_LOG_LEVEL: str = "INFO"
+    PARSER_RANDOM_USER_AGENT: bool = False
+    TEMPLATE_AUTO_RELOAD: bool = False
 
     TIMESCALE_BUCKET_INTERVAL: str = "1 day"
     DATABASE_SEARCH_PATH: str | None = None
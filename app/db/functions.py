@@ -7,14 +7,24 @@ from sqlalchemy.orm import Session
 from sqlalchemy.sql import ColumnElement
 
 from app.core.config import settings
+from app.db.session import engine
 
+_ENGINE_DIALECT = engine.dialect.name
 
-def day_bucket(db: Session, column) -> ColumnElement:
-    """Return a day-level bucket expression aware of the active dialect."""
 
-    bind = db.get_bind()
-    if bind and bind.dialect.name == "postgresql":
+def _day_bucket_for(dialect_name: str | None, column) -> ColumnElement:
+    if dialect_name == "postgresql":
         return func.time_bucket(settings.TIMESCALE_BUCKET_INTERVAL, column)
-    if bind and bind.dialect.name == "sqlite":
+    if dialect_name == "sqlite":
         return func.date(column)
     return func.date_trunc("day", column)
+
+
+def day_bucket(db: Session, column) -> ColumnElement:
+    """Return a day-level bucket expression aware of the active dialect."""
+
+    # The application engine's dialect is known at import; only a session bound
+    # to another engine (tests, overrides) needs its own bind consulted, and
+    # Session.bind is a plain attribute rather than get_bind()'s mapper lookup.
+    bind = db.bind
+    return _day_bucket_for(bind.dialect.name if bind is not None else _ENGINE_DIALECT, column)
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 class VectorAsJSON(TypeDecorator):
     """Store embeddings as pgvector on PostgreSQL and JSON elsewhere."""
 
-    impl = JSON
+    impl = JSON(none_as_null=True)
     cache_ok = True
 
     _import_error_logged = False
@@ -36,7 +36,7 @@ class VectorAsJSON(TypeDecorator):
                         "pgvector package not installed; falling back to JSON column for embeddings"
                     )
                     VectorAsJSON._import_error_logged = True
-        return dialect.type_descriptor(JSON())
+        return dialect.type_descriptor(JSON(none_as_null=True))
 
     def process_bind_param(self, value: Optional[Iterable[float]], dialect):  # type: ignore[override]
         if value is None:
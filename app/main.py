@@ -13,13 +13,16 @@ logging.basicConfig(
     ]
 )
 
-logging.getLogger('app.services.review_parser').setLevel(logging.DEBUG)
+from app.core.config import settings
+
+logging.getLogger('app.services.review_parser').setLevel(settings.PARSER_LOG_LEVEL.upper())
 
 from app.api.routes import analytics, auth, parser, reviews, widgets
 from app.db.base import Base
 from app.db.session import engine, ensure_extensions, wait_for_db
-from app.web import router as web_router, ws_router as web_ws_router
+from app.web import router as web_router, warm_templates, ws_router as web_ws_router
 from app.realtime import start_pubsub_listener
+from app.services.http_client import close_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +45,7 @@ app.include_router(web_ws_router)
 
 @app.on_event("startup")
 async def on_startup() -> None:
+    warm_templates()
     app.state.pubsub_task = asyncio.create_task(start_pubsub_listener())
 
 
@@ -52,3 +56,4 @@ async def on_shutdown() -> None:
         task.cancel()
         with suppress(asyncio.CancelledError):
             await task
+    await close_http_client()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Index, JSON, text
 from datetime import datetime
 
 from app.core.config import settings
@@ -8,6 +8,15 @@ from app.db.types import VectorAsJSON
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_date", "date"),
+        Index(
+            "ix_reviews_insights_date",
+            "date",
+            postgresql_where=text("insights IS NOT NULL"),
+            sqlite_where=text("insights IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product = Column(String, index=True)
@@ -17,5 +26,5 @@ class Review(Base):
     sentiment_score = Column(Float)
     sentiment_summary = Column(Text)
     embedding = Column(VectorAsJSON(settings.FOUNDATION_EMBEDDING_DIMENSION))
-    insights = Column(JSON)
+    insights = Column(JSON(none_as_null=True))
     cluster = Column(String, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -6,6 +6,7 @@ from app.db.base import Base
 
 class Widget(Base):
     __tablename__ = "widgets"
+    __table_args__ = (Index("ix_widgets_owner_id_id", "owner_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,12 @@
 """Realtime utilities for dashboard updates."""
 
 from .dashboard import dashboard_events, broadcast_refresh
-from .pubsub import publish_event_sync, start_pubsub_listener
+from .pubsub import publish_event_sync, publish_events_async, start_pubsub_listener
 
-__all__ = ["dashboard_events", "broadcast_refresh", "publish_event_sync", "start_pubsub_listener"]
+__all__ = [
+    "dashboard_events",
+    "broadcast_refresh",
+    "publish_event_sync",
+    "publish_events_async",
+    "start_pubsub_listener",
+]
@@ -1,8 +1,9 @@
 import asyncio
-import json
 import logging
 from contextlib import asynccontextmanager, suppress
+from typing import Iterable
 
+import orjson
 from redis import Redis
 from redis.asyncio import from_url as async_redis_from_url
 
@@ -17,7 +18,7 @@ def publish_event_sync(message: dict) -> None:
     client = None
     try:
         client = Redis.from_url(settings.REDIS_URL)
-        client.publish(CHANNEL, json.dumps(message))
+        client.publish(CHANNEL, orjson.dumps(message))
     except Exception:  # pragma: no cover - defensive
         logger.exception("Failed to publish realtime event")
     finally:
@@ -26,6 +27,24 @@ def publish_event_sync(message: dict) -> None:
                 client.close()
 
 
+async def publish_events_async(messages: Iterable[dict]) -> None:
+    """Publish several events over one connection in a single pipelined round trip."""
+    messages = list(messages)
+    if not messages:
+        return
+    client = async_redis_from_url(settings.REDIS_URL)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.publish(CHANNEL, orjson.dumps(message))
+            await pipe.execute()
+    except Exception:  # pragma: no cover - defensive
+        logger.exception("Failed to publish realtime events")
+    finally:
+        with suppress(Exception):
+            await client.aclose()
+
+
 @asynccontextmanager
 async def redis_pubsub():
     client = async_redis_from_url(settings.REDIS_URL)
@@ -46,10 +65,8 @@ async def start_pubsub_listener() -> None:
                     if message.get("type") != "message":
                         continue
                     data = message.get("data")
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8")
                     try:
-                        payload = json.loads(data)
+                        payload = orjson.loads(data)
                     except Exception:
                         logger.warning("Received malformed realtime payload: %s", data)
                         continue
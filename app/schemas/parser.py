@@ -47,6 +47,10 @@ class _BaseParserJob(BaseModel):
         default=None,
         description="Custom filename for results, defaults to sravni_reviews_{slug}.csv",
     )
+    include_rows: bool = Field(
+        default=True,
+        description="Return the parsed rows in the response in addition to the CSV file",
+    )
 
     @model_validator(mode="after")
     def validate_delays(self) -> "_BaseParserJob":
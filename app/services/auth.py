@@ -1,12 +1,22 @@
+from functools import lru_cache
+
 from sqlalchemy.orm import Session
 
 from app.models.user import User
-from app.core.security import verify_password
+from app.core.security import get_password_hash, verify_password
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return get_password_hash("dummy-password-for-timing")
 
 
 def authenticate_user(db: Session, email: str, password: str):
     user = db.query(User).filter(User.email == email).first()
     if not user:
+        # Spend the same bcrypt time as a real check so unknown emails are not
+        # distinguishable by response latency.
+        verify_password(password, _dummy_hash())
         return None
     if not verify_password(password, user.hashed_password):
         return None
@@ -0,0 +1,70 @@
+"""In-process cache for access-token resolution."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+_MAX_ENTRIES = 10_000
+
+
+class _TTLCache:
+    """Thread-safe LRU whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, object]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: object, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_tokens = _TTLCache()
+
+
+def _token_key(token: str) -> str:
+    # Keep digests rather than the bearer tokens themselves in memory.
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get(token: str) -> Optional[Dict[str, object]]:
+    return _tokens.get(_token_key(token))  # type: ignore[return-value]
+
+
+def put(token: str, identity: Dict[str, object], token_exp: Optional[float] = None) -> None:
+    ttl: float = settings.AUTH_CACHE_TTL_SECONDS
+    if token_exp is not None:
+        # Never serve a token from cache past its own "exp" claim.
+        ttl = min(ttl, token_exp - time.time())
+    _tokens.put(_token_key(token), identity, ttl)
+
+
+def invalidate(token: str) -> None:
+    _tokens.pop(_token_key(token))
+
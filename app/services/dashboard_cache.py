@@ -0,0 +1,101 @@
+"""Short-lived Redis cache for the dashboard overview aggregates."""
+
+import logging
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import orjson
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.review import Review
+
+logger = logging.getLogger(__name__)
+
+_OVERVIEW_KEY = "dashboard:overview"
+_VERSION_KEY = "dashboard:version"
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> Redis:
+    return Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1.0, socket_timeout=1.0)
+
+
+def _compute_overview(db: Session) -> Dict[str, Any]:
+    total_reviews, avg_sentiment = db.query(
+        func.count(Review.id), func.avg(Review.sentiment_score)
+    ).one()
+    latest_insights = (
+        db.query(Review.insights)
+        .filter(Review.insights.isnot(None))
+        .order_by(Review.date.desc())
+        .limit(5)
+        .all()
+    )
+    highlights: list[str] = []
+    for (details,) in latest_insights:
+        if isinstance(details, dict):
+            highlights.extend(details.get("highlights", [])[:2])
+    return {
+        "total_reviews": total_reviews or 0,
+        "average_sentiment": round(float(avg_sentiment), 2) if avg_sentiment else 0,
+        "highlights": highlights,
+    }
+
+
+def get_overview(db: Session) -> Dict[str, Any]:
+    ttl = settings.DASHBOARD_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return _compute_overview(db)
+    try:
+        cached = _get_client().get(_OVERVIEW_KEY)
+    except RedisError as exc:
+        logger.debug("Dashboard cache lookup failed: %s", exc)
+        cached = None
+    if cached is not None:
+        try:
+            return orjson.loads(cached)
+        except orjson.JSONDecodeError:
+            pass
+
+    overview = _compute_overview(db)
+    try:
+        _get_client().set(_OVERVIEW_KEY, orjson.dumps(overview), ex=ttl)
+    except RedisError as exc:
+        logger.debug("Dashboard cache store failed: %s", exc)
+    return overview
+
+
+def _new_version() -> str:
+    # Random rather than INCR: after a Redis flush a counter restarts and can
+    # climb back to a value an old ETag was built from.
+    return uuid.uuid4().hex
+
+
+def data_version() -> Optional[str]:
+    """Token replaced on every review data change, or None when Redis is unreachable."""
+    try:
+        client = _get_client()
+        value = client.get(_VERSION_KEY)
+        if value is None:
+            # Missing after a flush or on first use; never fall back to a fixed value.
+            client.set(_VERSION_KEY, _new_version(), nx=True)
+            value = client.get(_VERSION_KEY)
+    except RedisError as exc:
+        logger.debug("Dashboard version lookup failed: %s", exc)
+        return None
+    return value.decode() if value is not None else None
+
+
+def invalidate_overview() -> None:
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        pipe.delete(_OVERVIEW_KEY)
+        pipe.set(_VERSION_KEY, _new_version())
+        pipe.execute()
+    except RedisError as exc:
+        logger.debug("Dashboard cache invalidation failed: %s", exc)
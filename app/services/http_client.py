@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        follow_redirects=True,
+    )
+
+
+async def close_http_client() -> None:
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
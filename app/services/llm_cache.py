@@ -0,0 +1,63 @@
+"""Content-addressed Redis cache for LLM responses."""
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "llm_cache:"
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> Redis:
+    return Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1.0, socket_timeout=1.0)
+
+
+def _enabled() -> bool:
+    return settings.LLM_CACHE_TTL_SECONDS > 0
+
+
+def cache_key(*parts: str) -> str:
+    digest = hashlib.sha256(b"\x00".join(part.encode("utf-8") for part in parts))
+    return _KEY_PREFIX + digest.hexdigest()
+
+
+def get_json(key: str) -> Optional[Any]:
+    if not _enabled():
+        return None
+    try:
+        raw = _get_client().get(key)
+    except RedisError as exc:
+        logger.debug("LLM cache lookup failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        delete(key)
+        return None
+
+
+def set_json(key: str, value: Any) -> None:
+    if not _enabled():
+        return
+    try:
+        _get_client().set(key, orjson.dumps(value), ex=settings.LLM_CACHE_TTL_SECONDS)
+    except RedisError as exc:
+        logger.debug("LLM cache store failed: %s", exc)
+
+
+def delete(key: str) -> None:
+    try:
+        _get_client().delete(key)
+    except RedisError as exc:
+        logger.debug("LLM cache eviction failed: %s", exc)
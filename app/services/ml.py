@@ -4,11 +4,13 @@ import logging
 import re
 from typing import Any, Dict, Iterable, List, Literal, Optional
 
+import orjson
 from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 from pydantic import BaseModel, Field, ValidationError, field_validator
 from textblob import TextBlob
 
 from app.core.config import settings
+from app.services import llm_cache
 from app.services.openai_client import create_chat_completion, create_embeddings
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,7 @@ class SentimentPayload(BaseModel):
         if value is None or isinstance(value, str):
             return value
         try:
-            return json.dumps(value, ensure_ascii=False)
+            return orjson.dumps(value).decode()
         except (TypeError, ValueError):
             return str(value)
 
@@ -45,6 +47,41 @@ def _make_semaphore(limit: Optional[int]) -> asyncio.Semaphore:
 _embedding_semaphore = _make_semaphore(settings.FOUNDATION_EMBEDDING_CONCURRENCY)
 _chat_semaphore = _make_semaphore(settings.FOUNDATION_CHAT_CONCURRENCY)
 
+_SENTIMENT_PROMPT_PREFIX = (
+    "Ты аналитик, изучающий отзывы клиентов банка. "
+    "Проанализируй текст отзыва ниже и ответь строго JSON без пояснений с ключами "
+    "sentiment, sentiment_score, summary, highlights. "
+    "sentiment — одно из значений: positive, negative, neutral. "
+    "sentiment_score — число от -1 до 1. summary — краткое описание до 40 слов. "
+    "highlights — список ключевых тезисов (короткие строки).\n\n"
+    "Отзыв: "
+)
+
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (APIConnectionError, RateLimitError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code in _RETRYABLE_STATUS_CODES
+
+
+def _backoff_delay(attempt: int) -> float:
+    return min(settings.FOUNDATION_CHAT_BACKOFF_SECONDS * 2**attempt, _MAX_BACKOFF_SECONDS)
+
+
+def _payload_result(
+    payload: SentimentPayload, embedding: Optional[List[float]]
+) -> Dict[str, Any]:
+    return {
+        "sentiment": payload.sentiment,
+        "sentiment_score": payload.sentiment_score,
+        "summary": payload.summary,
+        "embedding": embedding,
+        "highlights": payload.highlights,
+    }
+
 
 def _fallback_analysis(text: str) -> Dict[str, Any]:
     blob = TextBlob(text)
@@ -64,21 +101,35 @@ def _fallback_analysis(text: str) -> Dict[str, Any]:
     }
 
 
+_FENCE_OPEN_RE = re.compile(r"^```[a-zA-Z0-9]*")
+_FENCE_CLOSE_RE = re.compile(r"```$")
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _decode_leading_object(text: str) -> Any:
+    """Decode the JSON value at the start of ``text`` and ignore whatever follows it."""
+    try:
+        return _JSON_DECODER.raw_decode(text)[0]
+    except json.JSONDecodeError:
+        return _JSON_DECODER.raw_decode(_TRAILING_COMMA_RE.sub(r"\1", text))[0]
+
+
 def _parse_payload(content: str) -> SentimentPayload:
     if not content:
         raise ValueError("Empty response")
     stripped = content.strip()
     if stripped.startswith("```"):
-        stripped = re.sub(r"^```[a-zA-Z0-9]*", "", stripped)
-        stripped = re.sub(r"```$", "", stripped).strip()
+        stripped = _FENCE_OPEN_RE.sub("", stripped)
+        stripped = _FENCE_CLOSE_RE.sub("", stripped).strip()
 
     try:
         return SentimentPayload.model_validate_json(stripped)
     except (ValidationError, json.JSONDecodeError):
-        match = re.search(r"\{.*\}", stripped, re.S)
-        if not match:
+        start = stripped.find("{")
+        if start == -1:
             raise
-        return SentimentPayload.model_validate_json(match.group(0))
+    return SentimentPayload.model_validate(_decode_leading_object(stripped[start:]))
 
 
 async def generate_embeddings_async(texts: Iterable[str]) -> List[Optional[List[float]]]:
@@ -133,16 +184,19 @@ async def analyze_text_async(
         local_embedding = vectors[0] if vectors else None
 
     last_error: Optional[Exception] = None
-    prompt = (
-        "Ты аналитик, изучающий отзывы клиентов банка. "
-        "Проанализируй текст отзыва ниже и ответь строго JSON без пояснений с ключами "
-        "sentiment, sentiment_score, summary, highlights. "
-        "sentiment — одно из значений: positive, negative, neutral. "
-        "sentiment_score — число от -1 до 1. summary — краткое описание до 40 слов. "
-        "highlights — список ключевых тезисов (короткие строки).\n\n"
-        f"Отзыв: "
-        f"""{text}"""
+    prompt = _SENTIMENT_PROMPT_PREFIX + text
+
+    # The prompt is part of the key so that editing it invalidates old entries.
+    # The cache client is blocking, so keep its round trips off the event loop.
+    cache_key = llm_cache.cache_key(
+        settings.FOUNDATION_CHAT_MODEL, _SENTIMENT_PROMPT_PREFIX, text
     )
+    cached = await asyncio.to_thread(llm_cache.get_json, cache_key)
+    if cached is not None:
+        try:
+            return _payload_result(SentimentPayload.model_validate(cached), local_embedding)
+        except ValidationError:
+            await asyncio.to_thread(llm_cache.delete, cache_key)
 
     retries = max(1, settings.FOUNDATION_CHAT_RETRIES)
     for attempt in range(retries):
@@ -158,16 +212,18 @@ async def analyze_text_async(
                 )
             content = completion.choices[0].message.content or ""
             payload = _parse_payload(content)
-            return {
-                "sentiment": payload.sentiment,
-                "sentiment_score": payload.sentiment_score,
-                "summary": payload.summary,
-                "embedding": local_embedding,
-                "highlights": payload.highlights,
-            }
+            await asyncio.to_thread(llm_cache.set_json, cache_key, payload.model_dump())
+            return _payload_result(payload, local_embedding)
         except (APIConnectionError, APITimeoutError, APIStatusError, RateLimitError) as exc:
             last_error = exc
-            delay = settings.FOUNDATION_CHAT_BACKOFF_SECONDS * (attempt + 1)
+            if not _is_retryable(exc) or attempt + 1 >= retries:
+                logger.warning(
+                    "Chat completion attempt %s failed (%s); giving up",
+                    attempt + 1,
+                    exc.__class__.__name__,
+                )
+                break
+            delay = _backoff_delay(attempt)
             logger.warning(
                 "Chat completion attempt %s failed (%s). Retrying in %.2fs",
                 attempt + 1,
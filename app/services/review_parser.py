@@ -1,36 +1,90 @@
 import asyncio
 import csv
-import json
 import logging
 import random
 import re
 import time
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from html import unescape
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
+import orjson
 import requests
 
-try:
-    from bs4 import BeautifulSoup  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency
-    BeautifulSoup = None  # type: ignore
-
-try:
-    from fake_useragent import UserAgent
-except ImportError:  # pragma: no cover - dependency provided at runtime
-    UserAgent = None  # type: ignore
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+# bs4, lxml and fake-useragent are imported on first use so that API workers
+# which never run a parser job do not pay for them at startup. All of them stay
+# optional: the loaders return None (or the stdlib parser) when a package is missing.
+@lru_cache(maxsize=1)
+def _beautiful_soup() -> Any:
+    try:
+        from bs4 import BeautifulSoup  # type: ignore
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return BeautifulSoup
+
+
+@lru_cache(maxsize=1)
+def _soup_features() -> str:
+    try:
+        import lxml  # type: ignore  # noqa: F401
+    except ImportError:  # pragma: no cover - optional dependency
+        return "html.parser"
+    return "lxml"
+
+
+@lru_cache(maxsize=1)
+def _user_agent_factory() -> Any:
+    try:
+        from fake_useragent import UserAgent
+    except ImportError:  # pragma: no cover - dependency provided at runtime
+        return None
+    return UserAgent
+
 GAZPROMBANK_ID = "5bb4f768245bc22a520a6115"
 GAZPROMBANK_SLUG = "gazprombank"
 GAZPROMBANK_NAME = "Газпромбанк"
 BANKI_RU_SLUG = "gazprombank"
 BANKI_RU_NAME = "Газпромбанк"
 
+REVIEW_CSV_HEADERS: tuple[str, ...] = (
+    "url",
+    "review_date",
+    "user_name",
+    "user_city",
+    "user_city_full",
+    "review_title",
+    "review_text",
+    "review_status",
+    "rating",
+    "review_tag",
+    "bank_name",
+    "is_bank_ans",
+    "review_id",
+)
+
+_MODULE_OPTIONS_RE = re.compile(
+    r'data-module-options=(?P<q>"|\')(?P<content>.*?)(?P=q)', re.DOTALL
+)
+_JSONLD_RE = re.compile(r'<script type="application/ld\+json">(.*?)</script>', re.DOTALL)
+_STATUS_BADGE_RE = re.compile(r"^Отзыв", re.IGNORECASE)
+_REVIEW_LINK_RE = re.compile(r"/services/responses/bank/.+\?id=([^&]+)(?:&|$)")
+# bs4's HTML tree builders already lowercase tag names.
+_CARD_CONTAINER_TAGS = frozenset({"article", "div", "section"})
+_PARAGRAPH_END_RE = re.compile(r"(?i)</p>")
+_LINE_BREAK_RE = re.compile(r"(?i)<br\s*/?>")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class ParserServiceError(RuntimeError):
     """Raised when parsing fails in a recoverable way."""
@@ -47,7 +101,11 @@ class ParseResult:
 
 
 class _UserAgentProvider:
-    """Provides random user agents with a safe fallback list."""
+    """Rotates through a preshuffled user agent list.
+
+    fake-useragent lookups are only used when ``randomize`` is requested
+    (``PARSER_RANDOM_USER_AGENT`` for the API parser service).
+    """
 
     _FALLBACK_USER_AGENTS: tuple[str, ...] = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -61,11 +119,15 @@ class _UserAgentProvider:
         "Chrome/123.0.0.0 Safari/537.36",
     )
 
-    def __init__(self) -> None:
+    def __init__(self, randomize: bool = False) -> None:
+        self._cycle = deque(
+            random.sample(self._FALLBACK_USER_AGENTS, len(self._FALLBACK_USER_AGENTS))
+        )
         self._ua = None
-        if UserAgent is not None:
+        user_agent_cls = _user_agent_factory() if randomize else None
+        if user_agent_cls is not None:
             try:
-                self._ua = UserAgent()
+                self._ua = user_agent_cls()
                 logger.debug("Initialized fake-useragent provider")
             except Exception as exc:  # pragma: no cover - defensive path
                 logger.warning("Failed to initialize fake-useragent: %s", exc)
@@ -77,7 +139,9 @@ class _UserAgentProvider:
                 return str(self._ua.random)
             except Exception as exc:  # pragma: no cover - defensive path
                 logger.debug("fake-useragent random lookup failed: %s", exc)
-        return random.choice(self._FALLBACK_USER_AGENTS)
+        user_agent = self._cycle[0]
+        self._cycle.rotate(-1)
+        return user_agent
 
 
 class _CsvWriter:
@@ -99,6 +163,21 @@ class _CsvWriter:
         logger.info("Wrote %s rows to %s", count, path)
         return path
 
+    @contextmanager
+    def stream(self, filename: str, headers: Sequence[str]) -> Iterator[Any]:
+        """Yield a positional csv writer; the file only replaces ``filename`` on success."""
+        path = self.base_dir / filename
+        partial_path = path.with_name(f"{path.name}.part")
+        try:
+            with partial_path.open("w", encoding="utf-8", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(headers)
+                yield writer
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        partial_path.replace(path)
+
 
 class SravniParser:
     """Parser for sravni.ru ratings and reviews."""
@@ -121,12 +200,14 @@ class SravniParser:
     )
     _DEFAULT_FINGER_PRINT = "1d345dd221ef718448c6bef7fc795d47"
 
-    def __init__(self, data_dir: Optional[Path] = None) -> None:
+    def __init__(
+        self, data_dir: Optional[Path] = None, randomize_user_agent: bool = False
+    ) -> None:
         root_dir = Path(__file__).resolve().parents[2]
         self.data_dir = data_dir or (root_dir / "data")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._csv_writer = _CsvWriter(self.data_dir)
-        self._user_agent_provider = _UserAgentProvider()
+        self._user_agent_provider = _UserAgentProvider(randomize=randomize_user_agent)
         self._session = requests.Session()
         self._max_retries = 6
         self._max_retries = 6
@@ -141,6 +222,7 @@ class SravniParser:
         output_filename: Optional[str] = None,
         finger_print: Optional[str] = None,
         delay_range: tuple[float, float] = (1.0, 2.0),
+        include_rows: bool = False,
     ) -> ParseResult:
         if page_size <= 0:
             raise ParserServiceError("Page size must be positive")
@@ -156,93 +238,82 @@ class SravniParser:
             "Starting sravni reviews parsing for %s (%s)", bank_name or slug, GAZPROMBANK_ID
         )
         delay_min, delay_max = delay_range
-        parsed_rows: List[Dict[str, Any]] = []
+        rows_written = 0
         finger = finger_print or self._DEFAULT_FINGER_PRINT
-        for page in range(max_pages):
-            page_url = self._REVIEWS_URL_TEMPLATE.format(
-                finger_print=finger,
-                page=page,
-                page_size=page_size,
-                bank_id=GAZPROMBANK_ID,
-            )
-            logger.debug("Fetching sravni reviews page %s url=%s", page, page_url)
-            response = self._session.get(
-                page_url,
-                headers=self._build_headers(referer=f"https://www.sravni.ru/bank/{slug}/otzyvy/"),
-                timeout=30,
-            )
-            if response.status_code == 429:
-                logger.warning("Received HTTP 429 on page %s, backing off for 60s", page)
-                time.sleep(60)
-                continue
-            if response.status_code != 200:
-                message = f"Unexpected response {response.status_code} on page {page}"
-                logger.error(message)
-                raise ParserServiceError(message)
-            try:
-                payload = response.json()
-            except ValueError as exc:
-                raise ParserServiceError(f"Failed to decode JSON on page {page}: {exc}") from exc
-            items = payload.get("items") or []
-            if not items:
-                logger.info("No review items returned on page %s, stopping", page)
-                break
+        filename = self._ensure_csv_filename(output_filename or f"sravni_reviews_{slug}.csv")
+        parsed_rows: List[Dict[str, Any]] = []
+        with self._csv_writer.stream(filename, REVIEW_CSV_HEADERS) as writer:
+            for page in range(max_pages):
+                page_url = self._REVIEWS_URL_TEMPLATE.format(
+                    finger_print=finger,
+                    page=page,
+                    page_size=page_size,
+                    bank_id=GAZPROMBANK_ID,
+                )
+                logger.debug("Fetching sravni reviews page %s url=%s", page, page_url)
+                response = self._session.get(
+                    page_url,
+                    headers=self._build_headers(referer=f"https://www.sravni.ru/bank/{slug}/otzyvy/"),
+                    timeout=30,
+                )
+                if response.status_code == 429:
+                    logger.warning("Received HTTP 429 on page %s, backing off for 60s", page)
+                    time.sleep(60)
+                    continue
+                if response.status_code != 200:
+                    message = f"Unexpected response {response.status_code} on page {page}"
+                    logger.error(message)
+                    raise ParserServiceError(message)
+                try:
+                    payload = orjson.loads(response.content)
+                except orjson.JSONDecodeError as exc:
+                    raise ParserServiceError(f"Failed to decode JSON on page {page}: {exc}") from exc
+                items = payload.get("items") or []
+                if not items:
+                    logger.info("No review items returned on page %s, stopping", page)
+                    break
 
-            page_rows, should_stop = self._process_review_items(
-                items=items,
-                start_date=start_date,
-                bank_name=bank_name,
-                slug=slug,
-            )
-            parsed_rows.extend(page_rows)
-            if page_rows:
-                sample = page_rows[0]
-                logger.info(
-                    "sravni page %s parsed review id=%s title=%s",
-                    page,
-                    sample.get("review_id"),
-                    (sample.get("review_title") or "")[:80],
+                page_items, should_stop = self._apply_start_date(items, start_date)
+                page_rows: Iterable[tuple[Any, ...]] = self._iter_review_rows(
+                    page_items, bank_name, slug
                 )
-            if should_stop:
-                logger.info("Reached start date threshold, stopping at page %s", page)
-                break
-            if len(items) < page_size:
-                logger.info("Last page reached based on returned item count")
-                break
-            if delay_max > 0:
-                time.sleep(random.uniform(delay_min, delay_max))
+                if include_rows:
+                    page_rows = list(page_rows)
+                    parsed_rows.extend(dict(zip(REVIEW_CSV_HEADERS, row)) for row in page_rows)
+                writer.writerows(page_rows)
+                rows_written += len(page_items)
+                if page_items:
+                    sample = page_items[0]
+                    logger.info(
+                        "sravni page %s parsed review id=%s title=%s",
+                        page,
+                        sample.get("id"),
+                        (sample.get("title") or "")[:80],
+                    )
+                if should_stop:
+                    logger.info("Reached start date threshold, stopping at page %s", page)
+                    break
+                if len(items) < page_size:
+                    logger.info("Last page reached based on returned item count")
+                    break
+                if delay_max > 0:
+                    time.sleep(random.uniform(delay_min, delay_max))
 
-        if not parsed_rows:
-            raise ParserServiceError("No reviews parsed for the specified bank")
+            if not rows_written:
+                raise ParserServiceError("No reviews parsed for the specified bank")
 
-        filename = self._ensure_csv_filename(output_filename or f"sravni_reviews_{slug}.csv")
-        headers = (
-            "url",
-            "review_date",
-            "user_name",
-            "user_city",
-            "user_city_full",
-            "review_title",
-            "review_text",
-            "review_status",
-            "rating",
-            "review_tag",
-            "bank_name",
-            "is_bank_ans",
-            "review_id",
-        )
-        path = self._csv_writer.write(filename, headers, parsed_rows)
+        path = self.data_dir / filename
         logger.info(
             "Finished sravni reviews parsing for %s (%s). Total reviews: %s",
             bank_name or slug,
             GAZPROMBANK_ID,
-            len(parsed_rows),
+            rows_written,
         )
         return ParseResult(
             source="gazprombank_reviews",
             filename=filename,
             csv_path=path,
-            rows_written=len(parsed_rows),
+            rows_written=rows_written,
             metadata={
                 "bank_id": GAZPROMBANK_ID,
                 "bank_slug": slug,
@@ -264,55 +335,50 @@ class SravniParser:
             headers["Referer"] = referer
         return headers
 
-    def _process_review_items(
+    def _apply_start_date(
         self,
-        items: Iterable[Dict[str, Any]],
+        items: Sequence[Dict[str, Any]],
         start_date: Optional[datetime],
-        bank_name: Optional[str],
-        slug: str,
-    ) -> tuple[List[Dict[str, Any]], bool]:
-        rows: List[Dict[str, Any]] = []
-        should_stop = False
-        threshold = start_date
-        for item in items:
-            review_id = item.get("id")
-            review_date_raw = item.get("date")
-            review_date = self._parse_datetime(review_date_raw)
-            if threshold and review_date and review_date < threshold:
+    ) -> tuple[Sequence[Dict[str, Any]], bool]:
+        if not start_date:
+            return items, False
+        for index, item in enumerate(items):
+            review_date = self._parse_datetime(item.get("date"))
+            if review_date and review_date < start_date:
                 logger.debug(
                     "Reached review date %s that is older than threshold %s",
                     review_date,
-                    threshold,
+                    start_date,
                 )
-                should_stop = True
-                break
-            url_review = (
-                f"https://www.sravni.ru/bank/{slug}/otzyvy/{review_id}/"
-                if review_id
-                else ""
-            )
-            rows.append(
-                {
-                    "url": url_review,
-                    "review_date": review_date_raw or "",
-                    "user_name": item.get("authorName", ""),
-                    "user_city": item.get("locationData", {}).get("name", "")
-                    if item.get("locationData")
-                    else "",
-                    "user_city_full": item.get("locationData", {}).get("fullName", "")
-                    if item.get("locationData")
-                    else "",
-                    "review_title": item.get("title", ""),
-                    "review_text": item.get("text", ""),
-                    "review_status": item.get("ratingStatus", ""),
-                    "rating": item.get("rating", ""),
-                    "review_tag": item.get("reviewTag", ""),
-                    "bank_name": bank_name or "",
-                    "is_bank_ans": item.get("hasCompanyResponse", False),
-                    "review_id": review_id or "",
-                }
+                return items[:index], True
+        return items, False
+
+    def _iter_review_rows(
+        self,
+        items: Iterable[Dict[str, Any]],
+        bank_name: Optional[str],
+        slug: str,
+    ) -> Iterator[tuple[Any, ...]]:
+        """Yield CSV rows positionally aligned with ``REVIEW_CSV_HEADERS``."""
+        bank_name = bank_name or ""
+        for item in items:
+            review_id = item.get("id")
+            location = item.get("locationData") or {}
+            yield (
+                f"https://www.sravni.ru/bank/{slug}/otzyvy/{review_id}/" if review_id else "",
+                item.get("date") or "",
+                item.get("authorName", ""),
+                location.get("name", ""),
+                location.get("fullName", ""),
+                item.get("title", ""),
+                item.get("text", ""),
+                item.get("ratingStatus", ""),
+                item.get("rating", ""),
+                item.get("reviewTag", ""),
+                bank_name,
+                item.get("hasCompanyResponse", False),
+                review_id or "",
             )
-        return rows, should_stop
 
     def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
         if not value:
@@ -343,12 +409,14 @@ class BankiRuParser:
     )
     _DEFAULT_MAX_RETRIES = 6
 
-    def __init__(self, data_dir: Optional[Path] = None) -> None:
+    def __init__(
+        self, data_dir: Optional[Path] = None, randomize_user_agent: bool = False
+    ) -> None:
         root_dir = Path(__file__).resolve().parents[2]
         self.data_dir = data_dir or (root_dir / "data")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._csv_writer = _CsvWriter(self.data_dir)
-        self._user_agent_provider = _UserAgentProvider()
+        self._user_agent_provider = _UserAgentProvider(randomize=randomize_user_agent)
         self._session = requests.Session()
         self._max_retries = self._DEFAULT_MAX_RETRIES
 
@@ -362,6 +430,7 @@ class BankiRuParser:
         output_filename: Optional[str] = None,
         finger_print: Optional[str] = None,  # noqa: ARG002 - совместимость схемы
         delay_range: tuple[float, float] = (1.0, 2.0),
+        include_rows: bool = False,
     ) -> ParseResult:
         if page_size <= 0:
             raise ParserServiceError("Page size must be positive")
@@ -450,23 +519,8 @@ class BankiRuParser:
             raise ParserServiceError("No reviews parsed for banki.ru")
 
         filename = self._ensure_csv_filename(output_filename or f"banki_ru_reviews_{slug}.csv")
-        headers = (
-            "url",
-            "review_date",
-            "user_name",
-            "user_city",
-            "user_city_full",
-            "review_title",
-            "review_text",
-            "review_status",
-            "rating",
-            "review_tag",
-            "bank_name",
-            "is_bank_ans",
-            "review_id",
-        )
         unique_rows = self._deduplicate_rows(parsed_rows)
-        path = self._csv_writer.write(filename, headers, unique_rows)
+        path = self._csv_writer.write(filename, REVIEW_CSV_HEADERS, unique_rows)
         logger.info(
             "Finished banki.ru reviews parsing for %s. Total reviews: %s",
             bank_name,
@@ -485,7 +539,7 @@ class BankiRuParser:
                 "page_size": page_size,
                 "skipped_pages": skipped_pages,
             },
-            rows=unique_rows,
+            rows=unique_rows if include_rows else [],
         )
 
     def _build_page_url(self, slug: str, page: int, page_size: int) -> str:
@@ -606,15 +660,11 @@ class BankiRuParser:
         html_content: str,
     ) -> tuple[List[Dict[str, Any]], bool, List[Dict[str, Any]], List[str]]:
         options: Optional[Dict[str, Any]] = None
-        for match in re.finditer(
-            r'data-module-options=(?P<q>"|\')(?P<content>.*?)(?P=q)',
-            html_content,
-            re.DOTALL,
-        ):
+        for match in _MODULE_OPTIONS_RE.finditer(html_content):
             raw_options = match.group("content")
             try:
-                candidate = json.loads(unescape(raw_options))
-            except json.JSONDecodeError:
+                candidate = orjson.loads(unescape(raw_options))
+            except orjson.JSONDecodeError:
                 continue
             if "responses" in candidate:
                 options = candidate
@@ -627,20 +677,19 @@ class BankiRuParser:
         responses = options.get("responses") or {}
         items = responses.get("data") or []
         has_more = bool(responses.get("hasMorePages"))
+        if not items:
+            # The caller stops on an empty page, so skip the JSON-LD and badge scans.
+            return items, has_more, [], []
         ld_reviews = self._extract_jsonld_reviews(html_content)
         statuses = self._extract_status_badges(html_content, items)
         return items, has_more, ld_reviews, statuses
 
     def _extract_jsonld_reviews(self, html_content: str) -> List[Dict[str, Any]]:
         reviews: List[Dict[str, Any]] = []
-        for match in re.finditer(
-            r'<script type="application/ld\+json">(.*?)</script>',
-            html_content,
-            re.DOTALL,
-        ):
+        for match in _JSONLD_RE.finditer(html_content):
             try:
-                payload = json.loads(match.group(1))
-            except json.JSONDecodeError:
+                payload = orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
                 continue
             if isinstance(payload, dict) and isinstance(payload.get("review"), list):
                 for entry in payload["review"]:
@@ -652,16 +701,21 @@ class BankiRuParser:
     def _extract_status_badges(
         self, html_content: str, items: Sequence[Dict[str, Any]]
     ) -> List[str]:
-        if BeautifulSoup is None or not items:
+        beautiful_soup = _beautiful_soup() if items else None
+        if beautiful_soup is None:
             return ["" for _ in items]
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = beautiful_soup(html_content, _soup_features())
+        # Index review links in a single document pass instead of one find() per item.
+        links: Dict[str, Any] = {}
+        for anchor in soup.find_all("a", href=_REVIEW_LINK_RE):
+            match = _REVIEW_LINK_RE.search(anchor["href"])
+            links.setdefault(match.group(1), anchor)
         result: List[str] = []
         for item in items:
             status_text = ""
             review_id = item.get("id")
             if review_id:
-                pattern = re.compile(rf"/services/responses/bank/.+\?id={review_id}(?:&|$)")
-                link = soup.find("a", href=pattern)
+                link = links.get(str(review_id))
                 container = None
                 if link:
                     container = link
@@ -669,11 +723,9 @@ class BankiRuParser:
                         container = container.parent
                         if container is None:
                             break
-                        if container and container.name and container.name.lower() in {"article", "div", "section"}:
+                        if container.name in _CARD_CONTAINER_TAGS:
                             # look for badge inside this container
-                            badge = container.find(
-                                string=re.compile(r"^Отзыв", re.IGNORECASE)
-                            )
+                            badge = container.find(string=_STATUS_BADGE_RE)
                             if badge:
                                 status_text = badge.strip()
                                 break
@@ -747,11 +799,11 @@ class BankiRuParser:
     def _normalize_text(self, value: str) -> str:
         if not value:
             return ""
-        normalized = re.sub(r"(?i)</p>", "\n", value)
-        normalized = re.sub(r"(?i)<br\s*/?>", "\n", normalized)
-        normalized = re.sub(r"<[^>]+>", " ", normalized)
+        normalized = _PARAGRAPH_END_RE.sub("\n", value)
+        normalized = _LINE_BREAK_RE.sub("\n", normalized)
+        normalized = _HTML_TAG_RE.sub(" ", normalized)
         normalized = unescape(normalized)
-        return re.sub(r"\s+", " ", normalized).strip()
+        return _WHITESPACE_RE.sub(" ", normalized).strip()
 
     def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
         if not value:
@@ -775,9 +827,13 @@ class BankiRuParser:
 class ParserService:
     """Async wrapper around Sravni parser for use in FastAPI routes."""
 
-    def __init__(self) -> None:
-        self._sravni_parser = SravniParser()
-        self._banki_parser = BankiRuParser(self._sravni_parser.data_dir)
+    def __init__(self, randomize_user_agent: Optional[bool] = None) -> None:
+        if randomize_user_agent is None:
+            randomize_user_agent = settings.PARSER_RANDOM_USER_AGENT
+        self._sravni_parser = SravniParser(randomize_user_agent=randomize_user_agent)
+        self._banki_parser = BankiRuParser(
+            self._sravni_parser.data_dir, randomize_user_agent=randomize_user_agent
+        )
 
     @property
     def data_dir(self) -> Path:
@@ -794,6 +850,7 @@ class ParserService:
         output_filename: Optional[str] = None,
         finger_print: Optional[str] = None,
         delay_range: tuple[float, float] = (1.0, 2.0),
+        include_rows: bool = False,
     ) -> ParseResult:
         return await asyncio.to_thread(
             self._sravni_parser.parse_gazprombank_reviews,
@@ -805,6 +862,7 @@ class ParserService:
             output_filename,
             finger_print,
             delay_range,
+            include_rows,
         )
 
     async def parse_banki_ru_reviews(
@@ -818,6 +876,7 @@ class ParserService:
         output_filename: Optional[str] = None,
         finger_print: Optional[str] = None,
         delay_range: tuple[float, float] = (1.0, 2.0),
+        include_rows: bool = False,
     ) -> ParseResult:
         return await asyncio.to_thread(
             self._banki_parser.parse_reviews,
@@ -829,6 +888,7 @@ class ParserService:
             output_filename,
             finger_print,
             delay_range,
+            include_rows,
         )
 
     def resolve_csv_path(self, filename: str) -> Path:
@@ -1,11 +1,15 @@
+import asyncio
 from datetime import datetime
-from typing import Iterable, List, Optional
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.review import Review
+from app.services.dashboard_cache import invalidate_overview
 from app.services.pipeline import process_reviews
-from app.realtime.pubsub import publish_event_sync
+from app.realtime.pubsub import publish_events_async
 
 
 def _parse_date(value: Optional[str]) -> Optional[datetime]:
@@ -17,22 +21,55 @@ def _parse_date(value: Optional[str]) -> Optional[datetime]:
         return None
 
 
-def _build_review(record: dict, analysis: dict) -> Review:
-    review = Review(
-        product=record.get("product"),
-        text=record.get("text", ""),
-        date=_parse_date(record.get("date")) or datetime.utcnow(),
-        sentiment=analysis.get("sentiment"),
-        sentiment_score=analysis.get("sentiment_score"),
-        sentiment_summary=analysis.get("summary"),
-    )
+# Rows are inserted and progress is published once per batch rather than per review.
+_IMPORT_BATCH_SIZE = 100
+
+# The only upload fields the importer reads; anything else in a row is dropped.
+IMPORT_FIELDS = ("product", "text", "date")
+
+
+def pack_records(records: Iterable[dict]) -> Dict[str, list]:
+    """Columnar form of upload records for the Celery payload.
+
+    Field names are sent once instead of once per row, and unused CSV columns
+    never reach the broker.
+    """
+    records = list(records)
+    return {field: [record.get(field) for record in records] for field in IMPORT_FIELDS}
+
+
+def unpack_records(columns: Dict[str, list]) -> List[dict]:
+    return [
+        dict(zip(IMPORT_FIELDS, values))
+        for values in zip(*(columns[field] for field in IMPORT_FIELDS))
+    ]
+
+
+def analysis_columns(analysis: dict) -> dict:
+    """Map a sentiment analysis result onto Review column values."""
+    values = {
+        "sentiment": analysis.get("sentiment"),
+        "sentiment_score": analysis.get("sentiment_score"),
+        "sentiment_summary": analysis.get("summary"),
+    }
+    # Every row carries the same keys so a batch stays one executemany; the JSON
+    # columns are declared none_as_null, so None is stored as SQL NULL.
     embedding = analysis.get("embedding")
-    if embedding is not None:
-        review.embedding = [float(value) for value in embedding]
+    values["embedding"] = (
+        [float(value) for value in embedding] if embedding is not None else None
+    )
     highlights = analysis.get("highlights")
-    if highlights:
-        review.insights = {"highlights": list(highlights)[:5]}
-    return review
+    values["insights"] = {"highlights": list(highlights)[:5]} if highlights else None
+    return values
+
+
+def _review_row(record: dict, analysis: dict) -> dict:
+    return {
+        "product": record.get("product"),
+        "text": record.get("text") or "",
+        "date": _parse_date(record.get("date")) or datetime.utcnow(),
+        **analysis_columns(analysis),
+    }
 
 
 async def import_reviews_async(
@@ -44,24 +81,40 @@ async def import_reviews_async(
 
     texts = [record.get("text", "") or "" for record in records]
     analyses = await process_reviews(texts)
+    rows = [_review_row(record, analysis) for record, analysis in zip(records, analyses)]
 
+    # Callers pair the returned reviews with their records, so RETURNING order must
+    # follow the parameters. PostgreSQL keeps that batched through the autoincrement
+    # sentinel. SQLite has no sentinel support and would drop to one INSERT per row;
+    # it numbers the rows of a single multi-row INSERT in VALUES order, so the ids
+    # are sorted instead there.
+    sort_by_id = db.get_bind().dialect.name == "sqlite"
+    statement = insert(Review).returning(Review, sort_by_parameter_order=not sort_by_id)
     reviews: List[Review] = []
-    total = len(records)
-    for index, (record, analysis) in enumerate(zip(records, analyses), start=1):
-        review = _build_review(record, analysis)
-        db.add(review)
-        reviews.append(review)
+    total = len(rows)
+    for offset in range(0, total, _IMPORT_BATCH_SIZE):
+        batch = rows[offset : offset + _IMPORT_BATCH_SIZE]
+        # render_nulls keeps None-valued keys in the parameter sets; otherwise the ORM
+        # drops them per row and splits the batch into one INSERT per key set.
+        inserted = db.scalars(statement, batch, execution_options={"render_nulls": True}).all()
+        reviews.extend(sorted(inserted, key=attrgetter("id")) if sort_by_id else inserted)
         if job_id:
-            publish_event_sync(
-                {
-                    "type": "import_progress",
-                    "job_id": job_id,
-                    "processed": index,
-                    "total": total,
-                }
+            await publish_events_async(
+                [
+                    {
+                        "type": "import_progress",
+                        "job_id": job_id,
+                        "processed": len(reviews),
+                        "total": total,
+                    }
+                ]
             )
 
-    db.commit()
+    # RETURNING already loaded every column; detach the rows so the commit does not
+    # expire them and force a SELECT per review when the caller serializes them.
     for review in reviews:
-        db.refresh(review)
+        db.expunge(review)
+    db.commit()
+    # The cache client is blocking; keep it off the event loop of the async API route.
+    await asyncio.to_thread(invalidate_overview)
     return reviews
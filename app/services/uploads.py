@@ -0,0 +1,49 @@
+"""Parsing of uploaded review files into import records."""
+
+import csv
+import io
+from typing import BinaryIO, List
+
+import orjson
+
+
+class UnsupportedUploadError(ValueError):
+    """Raised when an uploaded file is neither JSON nor CSV."""
+
+
+class _ReadOnlyStream(io.RawIOBase):
+    """Raw stream over anything with ``read()``.
+
+    SpooledTemporaryFile only gained ``readable()``/``seekable()`` in Python 3.11,
+    and TextIOWrapper needs them; closing the adapter leaves the upload open.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _read_csv(stream: BinaryIO) -> List[dict]:
+    # Decode the spooled upload incrementally instead of copying the whole body
+    # into bytes, then a str, then a StringIO before the csv module sees it.
+    raw = io.BufferedReader(_ReadOnlyStream(stream))
+    with io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+        return list(csv.DictReader(text))
+
+
+def parse_review_upload(filename: str, stream: BinaryIO) -> List[dict]:
+    if filename.endswith(".json"):
+        data = orjson.loads(stream.read())
+        if isinstance(data, dict):
+            data = [data]
+        return list(data)
+    if filename.endswith(".csv"):
+        return _read_csv(stream)
+    raise UnsupportedUploadError(f"Unsupported file type: {filename}")
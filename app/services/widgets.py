@@ -1,6 +1,6 @@
 from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List
 
 from sqlalchemy import func, case
 from sqlalchemy.orm import Session
@@ -14,52 +14,50 @@ from app.schemas.widget import MetricType
 @dataclass(frozen=True)
 class MetricDefinition:
     label: str
-    calculator: Callable[[Session], float]
+    # Derives the metric from one row of _aggregate_columns(), whether that row
+    # covers every review or a single day, so cards and series cannot disagree.
+    value: Callable[[Any], float]
 
 
-def _count_by_sentiment(db: Session, sentiment: str | None) -> int:
-    query = db.query(func.count(Review.id))
-    if sentiment is None:
-        query = query.filter(Review.sentiment.is_(None))
-    else:
-        query = query.filter(Review.sentiment == sentiment)
-    return query.scalar() or 0
+def _sentiment_count(sentiment: str | None):
+    condition = Review.sentiment.is_(None) if sentiment is None else Review.sentiment == sentiment
+    return func.sum(case((condition, 1), else_=0))
 
 
-def _average_sentiment(db: Session) -> float:
-    result = db.query(func.avg(Review.sentiment_score)).scalar()
-    return float(result or 0)
+def _aggregate_columns() -> tuple:
+    return (
+        func.count(Review.id).label("total"),
+        _sentiment_count("positive").label("positive"),
+        _sentiment_count("negative").label("negative"),
+        _sentiment_count("neutral").label("neutral"),
+        _sentiment_count(None).label("unlabeled"),
+        func.avg(Review.sentiment_score).label("avg_score"),
+    )
 
 
-def _positive_share(db: Session) -> float:
-    total = db.query(func.count(Review.id)).scalar() or 0
-    if not total:
+def _positive_share(row: Any) -> float:
+    if not row.total:
         return 0.0
-    positive = _count_by_sentiment(db, "positive")
-    return round(positive / total * 100, 2)
+    return round((row.positive or 0) / row.total * 100, 2)
 
 
 METRIC_MAP: Dict[MetricType, MetricDefinition] = {
-    "total_reviews": MetricDefinition(
-        label="Total Reviews", calculator=lambda db: db.query(func.count(Review.id)).scalar() or 0
-    ),
+    "total_reviews": MetricDefinition(label="Total Reviews", value=lambda row: row.total),
     "positive_reviews": MetricDefinition(
-        label="Positive Reviews", calculator=lambda db: _count_by_sentiment(db, "positive")
+        label="Positive Reviews", value=lambda row: row.positive
     ),
     "negative_reviews": MetricDefinition(
-        label="Negative Reviews", calculator=lambda db: _count_by_sentiment(db, "negative")
-    ),
-    "neutral_reviews": MetricDefinition(
-        label="Neutral Reviews", calculator=lambda db: _count_by_sentiment(db, "neutral")
+        label="Negative Reviews", value=lambda row: row.negative
     ),
+    "neutral_reviews": MetricDefinition(label="Neutral Reviews", value=lambda row: row.neutral),
     "unlabeled_reviews": MetricDefinition(
-        label="Unlabeled Reviews", calculator=lambda db: _count_by_sentiment(db, None)
+        label="Unlabeled Reviews", value=lambda row: row.unlabeled
     ),
     "average_sentiment": MetricDefinition(
-        label="Average Sentiment Score", calculator=_average_sentiment
+        label="Average Sentiment Score", value=lambda row: row.avg_score
     ),
     "positive_share": MetricDefinition(
-        label="Positive Review Share (%)", calculator=_positive_share
+        label="Positive Review Share (%)", value=_positive_share
     ),
 }
 
@@ -68,56 +66,46 @@ def available_metrics() -> Iterable[tuple[str, MetricDefinition]]:
     return METRIC_MAP.items()
 
 
+def _metric_value(metric: MetricDefinition | None, row: Any) -> float:
+    if not metric:
+        return 0.0
+    return float(metric.value(row) or 0)
+
+
 def compute_widget_value(widget: Widget, db: Session) -> float:
     metric = METRIC_MAP.get(widget.metric)
     if not metric:
         return 0.0
-    return float(metric.calculator(db))
+    return _metric_value(metric, db.query(*_aggregate_columns()).one())
+
+
+def compute_widget_values(widgets: Iterable[Widget], db: Session) -> Dict[int, float]:
+    """Values for many widgets at once, from a single aggregate query over reviews."""
+    widgets = list(widgets)
+    if not widgets:
+        return {}
+    row = db.query(*_aggregate_columns()).one()
+    return {widget.id: _metric_value(METRIC_MAP.get(widget.metric), row) for widget in widgets}
 
 
 def _day_expression(db: Session):
     return day_bucket(db, Review.date)
 
 
+def timeseries_all(db: Session) -> Dict[MetricType, List[Dict[str, float]]]:
+    """Daily series for every metric, aggregated in a single GROUP BY pass."""
+    day_expr = _day_expression(db).label("day")
+    query = db.query(day_expr, *_aggregate_columns()).group_by(day_expr).order_by(day_expr)
+
+    series: Dict[MetricType, List[Dict[str, float]]] = {metric: [] for metric in METRIC_MAP}
+    for row in query.all():
+        iso = row.day if isinstance(row.day, str) else row.day.isoformat()
+        for metric, definition in METRIC_MAP.items():
+            series[metric].append({"date": iso, "value": _metric_value(definition, row)})
+    return series
+
+
 def timeseries_for_metric(db: Session, metric: MetricType) -> List[Dict[str, float]]:
     if metric not in METRIC_MAP:
         raise ValueError(f"Unsupported metric: {metric}")
-    day_expr = _day_expression(db).label("day")
-
-    if metric == "average_sentiment":
-        query = (
-            db.query(day_expr, func.avg(Review.sentiment_score).label("value"))
-            .group_by(day_expr)
-            .order_by(day_expr)
-        )
-    elif metric == "positive_share":
-        positive_case = func.sum(
-            case((Review.sentiment == "positive", 1), else_=0)
-        )
-        total_count = func.count(Review.id)
-        query = (
-            db.query(
-                day_expr,
-                (positive_case * 100.0 / func.nullif(total_count, 0)).label("value"),
-            )
-            .group_by(day_expr)
-            .order_by(day_expr)
-        )
-    else:
-        count_query = (
-            db.query(day_expr, func.count(Review.id).label("value"))
-            .group_by(day_expr)
-            .order_by(day_expr)
-        )
-        if metric in {"positive_reviews", "negative_reviews", "neutral_reviews"}:
-            sentiment_label = metric.split("_")[0]
-            count_query = count_query.filter(Review.sentiment == sentiment_label)
-        elif metric == "unlabeled_reviews":
-            count_query = count_query.filter(Review.sentiment.is_(None))
-        query = count_query
-
-    results = []
-    for day, value in query.all():
-        iso = day if isinstance(day, str) else day.isoformat()
-        results.append({"date": iso, "value": float(value or 0)})
-    return results
+    return timeseries_all(db)[metric]
@@ -1,10 +1,10 @@
 import asyncio
-from typing import List
+from typing import Dict, List, Union
 
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
-from app.realtime.pubsub import publish_event_sync
-from app.services.reviews import import_reviews_async
+from app.realtime.pubsub import publish_events_async
+from app.services.reviews import import_reviews_async, unpack_records
 
 
 async def _process(records: List[dict], job_id: str) -> int:
@@ -13,25 +13,31 @@ async def _process(records: List[dict], job_id: str) -> int:
 
     db = SessionLocal()
     try:
-        publish_event_sync(
-            {
-                "type": "import_progress",
-                "job_id": job_id,
-                "processed": 0,
-                "total": len(records),
-            }
+        await publish_events_async(
+            [
+                {
+                    "type": "import_progress",
+                    "job_id": job_id,
+                    "processed": 0,
+                    "total": len(records),
+                }
+            ]
         )
         await import_reviews_async(db, records, job_id=job_id)
     finally:
         db.close()
-    publish_event_sync({"type": "reviews_updated"})
-    publish_event_sync(
-        {"type": "import_completed", "job_id": job_id, "count": len(records)}
+    await publish_events_async(
+        [
+            {"type": "reviews_updated"},
+            {"type": "import_completed", "job_id": job_id, "count": len(records)},
+        ]
     )
     return len(records)
 
 
 @celery_app.task
-def import_reviews_task(records: List[dict]):
+def import_reviews_task(payload: Union[Dict[str, list], List[dict]]):
+    # Row lists are still accepted so messages queued before the columnar format drain.
+    records = unpack_records(payload) if isinstance(payload, dict) else payload
     job_id = import_reviews_task.request.id or ""
     return asyncio.run(_process(records, job_id))
@@ -1,29 +1,52 @@
+import asyncio
+from typing import List
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.review import Review
-from app.services.ml import analyze_text
+from app.services.dashboard_cache import invalidate_overview
+from app.services.pipeline import process_reviews
+from app.services.reviews import analysis_columns
 
 
-@celery_app.task
-def analyze_sentiment_task(review_id: int):
+def _update_columns(analysis: dict) -> dict:
+    # A re-analysis without an embedding or highlights keeps the stored ones.
+    return {
+        key: value
+        for key, value in analysis_columns(analysis).items()
+        if value is not None or key not in ("embedding", "insights")
+    }
+
+
+def _analyze_reviews(review_ids: List[int]) -> int:
     db: Session = SessionLocal()
     try:
-        review = db.query(Review).get(review_id)
-        if review is None:
-            return
-        result = analyze_text(review.text)
-        review.sentiment = result.get("sentiment")
-        review.sentiment_score = result.get("sentiment_score")
-        review.sentiment_summary = result.get("summary")
-        embedding = result.get("embedding")
-        if embedding is not None:
-            review.embedding = [float(value) for value in embedding]
-        highlights = result.get("highlights")
-        if highlights:
-            review.insights = {"highlights": highlights}
-        db.add(review)
+        rows = (
+            db.query(Review.id, Review.text)
+            .filter(Review.id.in_(review_ids))
+            .all()
+        )
+        if not rows:
+            return 0
+        # One embeddings request for the batch, chat calls fanned out under the semaphore.
+        analyses = asyncio.run(process_reviews(text or "" for _, text in rows))
+        db.execute(
+            update(Review),
+            [
+                {"id": review_id, **_update_columns(analysis)}
+                for (review_id, _), analysis in zip(rows, analyses)
+            ],
+        )
         db.commit()
+        invalidate_overview()
+        return len(rows)
     finally:
         db.close()
+
+
+@celery_app.task
+def analyze_sentiment_task(review_id: int):
+    _analyze_reviews([review_id])
@@ -1,3 +1,3 @@
-from .routes import router, ws_router
+from .routes import router, warm_templates, ws_router
 
-__all__ = ["router", "ws_router"]
+__all__ = ["router", "warm_templates", "ws_router"]
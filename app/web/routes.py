@@ -1,3 +1,5 @@
+import hashlib
+from pathlib import Path
 from typing import Dict, Optional
 from urllib.parse import quote_plus
 
@@ -12,8 +14,10 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Union, Dict, Any
@@ -29,8 +33,13 @@ from app.models.Chart import ChartRequest, ChartResponse, ChartItem
 from app.realtime import broadcast_refresh, dashboard_events
 from app.schemas.review import ReviewOut
 from app.schemas.widget import MetricType, VisualizationType
+from app.services import auth_cache
 from app.services.auth import authenticate_user
-from app.services.widgets import METRIC_MAP, compute_widget_value, timeseries_for_metric
+from app.services.dashboard_cache import data_version, get_overview
+from app.services.http_client import get_http_client
+from app.services.reviews import pack_records
+from app.services.uploads import UnsupportedUploadError, parse_review_upload
+from app.services.widgets import METRIC_MAP, compute_widget_values, timeseries_for_metric
 from app.tasks.import_reviews import import_reviews_task
 import httpx
 
@@ -38,7 +47,37 @@ import httpx
 router = APIRouter(tags=["web"])
 ws_router = APIRouter()
 
-templates = Jinja2Templates(directory="app/templates")
+_TEMPLATE_NAMES = ("base.html", "dashboard.html", "login.html", "register.html")
+
+
+def _template_environment() -> Environment:
+    # Without auto_reload every render stats the template source; the bytecode cache
+    # lets fresh workers skip parsing templates another process already compiled.
+    return Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=True,
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+templates = Jinja2Templates(env=_template_environment())
+
+
+def _dashboard_build_id() -> str:
+    # Computed once per process: a deploy that edits the templates or this module
+    # (which builds the dashboard context) must not keep answering 304.
+    sources = [Path(__file__)] + [Path("app/templates") / name for name in _TEMPLATE_NAMES]
+    stamps = [(str(path), path.stat().st_mtime_ns) for path in sources if path.exists()]
+    return hashlib.sha256(repr(stamps).encode("utf-8")).hexdigest()[:16]
+
+
+_DASHBOARD_BUILD_ID = _dashboard_build_id()
+
+
+def warm_templates() -> None:
+    for name in _TEMPLATE_NAMES:
+        templates.get_template(name)
 
 
 AVAILABLE_METRICS: Dict[MetricType, str] = {
@@ -62,11 +101,41 @@ def _get_optional_user(request: Request, db: Session) -> Optional[User]:
         return None
 
 
+def _user_widgets(db: Session, user: User) -> List[Widget]:
+    return (
+        db.query(Widget)
+        .filter(Widget.owner_id == user.id)
+        .order_by(Widget.id.asc())
+        .all()
+    )
+
+
+def _dashboard_etag(
+    request: Request, db: Session, user: User, widgets: List[Widget]
+) -> Optional[str]:
+    # The data version is a fresh random token after every import or sentiment
+    # update, and a new one after a Redis flush, so an old ETag never matches again.
+    version = data_version()
+    if version is None:
+        return None
+    latest_review_id = db.query(func.max(Review.id)).scalar()
+    state = (
+        _DASHBOARD_BUILD_ID,
+        user.id,
+        request.cookies.get("access_token", ""),
+        version,
+        latest_review_id,
+        [(w.id, w.title, w.metric, w.visualization) for w in widgets],
+    )
+    return '"' + hashlib.sha256(repr(state).encode("utf-8")).hexdigest() + '"'
+
+
 def _dashboard_context(
     request: Request,
     db: Session,
     user: User,
     *,
+    widgets: Optional[List[Widget]] = None,
     status: Optional[str] = None,
     error: Optional[str] = None,
 ) -> Dict:
@@ -80,39 +149,21 @@ def _dashboard_context(
         ReviewOut.model_validate(review).model_dump(mode="json")
         for review in recent_reviews
     ]
-    widgets = (
-        db.query(Widget)
-        .filter(Widget.owner_id == user.id)
-        .order_by(Widget.id.asc())
-        .all()
-    )
+    if widgets is None:
+        widgets = _user_widgets(db, user)
+    widget_values = compute_widget_values(widgets, db)
     widget_cards = [
         {
             "id": widget.id,
             "title": widget.title,
             "metric": widget.metric,
             "label": AVAILABLE_METRICS.get(widget.metric, widget.metric),
-            "value": compute_widget_value(widget, db),
+            "value": widget_values[widget.id],
             "visualization": widget.visualization,
         }
         for widget in widgets
     ]
 
-    total_reviews = db.query(Review).count()
-    avg_sentiment = db.query(func.avg(Review.sentiment_score)).scalar() or 0
-    latest_insights = (
-        db.query(Review)
-        .filter(Review.insights.isnot(None))
-        .order_by(Review.date.desc())
-        .limit(5)
-        .all()
-    )
-    highlights: list[str] = []
-    for review in latest_insights:
-        details = review.insights or {}
-        if isinstance(details, dict):
-            highlights.extend(details.get("highlights", [])[:2])
-
     auth_token = request.cookies.get("access_token", "")
 
     return {
@@ -122,11 +173,7 @@ def _dashboard_context(
         "widgets": widget_cards,
         "available_metrics": AVAILABLE_METRICS,
         "available_visualizations": AVAILABLE_VISUALIZATIONS,
-        "overview": {
-            "total_reviews": total_reviews,
-            "average_sentiment": round(float(avg_sentiment), 2) if avg_sentiment else 0,
-            "highlights": highlights,
-        },
+        "overview": get_overview(db),
         "status": status,
         "error": error,
         "auth_token": auth_token,
@@ -140,8 +187,18 @@ def home(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/login", status_code=303)
     status = request.query_params.get("status")
     error = request.query_params.get("error")
-    context = _dashboard_context(request, db, user, status=status, error=error)
-    return templates.TemplateResponse("dashboard.html", context)
+    widgets = _user_widgets(db, user)
+    etag = _dashboard_etag(request, db, user, widgets)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else {}
+    if etag and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+
+    context = _dashboard_context(
+        request, db, user, widgets=widgets, status=status, error=error
+    )
+    response = templates.TemplateResponse("dashboard.html", context)
+    response.headers.update(cache_headers)
+    return response
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -218,14 +275,17 @@ def register(
 
 
 @router.get("/logout")
-def logout():
+def logout(request: Request):
+    token = request.cookies.get("access_token")
+    if token:
+        auth_cache.invalidate(token)
     response = RedirectResponse(url="/login", status_code=303)
     response.delete_cookie("access_token")
     return response
 
 
 @router.post("/upload")
-async def upload_reviews(
+def upload_reviews(
     request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -234,27 +294,13 @@ async def upload_reviews(
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
-    contents = await file.read()
-    records = []
-
-    if file.filename.endswith(".json"):
-        import json
-
-        data = json.loads(contents)
-        if isinstance(data, dict):
-            data = [data]
-        records = list(data)
-    elif file.filename.endswith(".csv"):
-        import csv
-        import io
-
-        reader = csv.DictReader(io.StringIO(contents.decode()))
-        records = list(reader)
-    else:
+    try:
+        records = parse_review_upload(file.filename, file.file)
+    except UnsupportedUploadError:
         error_message = quote_plus("Unsupported file type. Please upload JSON or CSV.")
         return RedirectResponse(url=f"/?error={error_message}", status_code=303)
 
-    job = import_reviews_task.delay(records)
+    job = import_reviews_task.delay(pack_records(records))
     status_message = quote_plus("Import started…")
     return RedirectResponse(
         url=f"/?status={status_message}&job={job.id}",
@@ -274,18 +320,8 @@ def add_widget(
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
-    if metric not in AVAILABLE_METRICS:
-        return RedirectResponse(
-            url=f"/?error={quote_plus('Unsupported metric selection.')}",
-            status_code=303,
-        )
-
-    if visualization not in AVAILABLE_VISUALIZATIONS:
-        return RedirectResponse(
-            url=f"/?error={quote_plus('Unsupported visualization type.')}",
-            status_code=303,
-        )
-
+    # metric and visualization are Literal-typed form fields, so FastAPI has
+    # already rejected anything outside MetricType/VisualizationType with a 422.
     widget = Widget(title=title, metric=metric, visualization=visualization, owner_id=user.id)
     db.add(widget)
     db.commit()
@@ -358,24 +394,30 @@ def widget_timeseries(
     )
 
 
-@ws_router.websocket("/ws/dashboard")
-async def dashboard_websocket(websocket: WebSocket):
+def _token_is_valid(token: str) -> bool:
+    # Hold a pooled connection only for the auth check, not for the socket's lifetime.
     db = SessionLocal()
     try:
-        token = websocket.cookies.get("access_token")
-        if not token:
-            auth_header = websocket.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ", 1)[1]
-        if not token:
-            await websocket.close(code=1008)
-            return
-        try:
-            get_user_from_token(token, db)
-        except HTTPException:
-            await websocket.close(code=1008)
-            return
+        get_user_from_token(token, db)
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+    return True
+
 
+@ws_router.websocket("/ws/dashboard")
+async def dashboard_websocket(websocket: WebSocket):
+    token = websocket.cookies.get("access_token")
+    if not token:
+        auth_header = websocket.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ", 1)[1]
+    if not token or not await run_in_threadpool(_token_is_valid, token):
+        await websocket.close(code=1008)
+        return
+
+    try:
         await dashboard_events.connect(websocket)
         while True:
             await websocket.receive_text()
@@ -384,8 +426,6 @@ async def dashboard_websocket(websocket: WebSocket):
     except Exception:
         await dashboard_events.disconnect(websocket)
         await websocket.close(code=1011)
-    finally:
-        db.close()
 
 @router.post("/generate-chart", response_model=ChartResponse)
 async def generate_report_via_agent(request: ChartRequest):
@@ -396,13 +436,12 @@ async def generate_report_via_agent(request: ChartRequest):
     CHART_AGENT_URL = "http://dashboard-api:8003/generate-chart"
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                CHART_AGENT_URL,
-                json={"data": request.data}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().post(
+            CHART_AGENT_URL,
+            json={"data": request.data}
+        )
+        response.raise_for_status()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=500,
@@ -430,13 +469,13 @@ async def generate_pdf_report_via_agent(charts: List[ChartItem]):
     try:
         payload = [chart.model_dump() for chart in charts]
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                DASHBOARD_AGENT_URL,
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()  
+        response = await get_http_client().post(
+            DASHBOARD_AGENT_URL,
+            json=payload,
+            timeout=60.0,
+        )
+        response.raise_for_status()
+        return response.json()
 
     except httpx.RequestError as e:
         raise HTTPException(
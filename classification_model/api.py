@@ -1,3 +1,5 @@
+from typing import List
+
 from fastapi import FastAPI
 import torch
 from transformers import pipeline
@@ -31,12 +33,15 @@ class BertModel:
             model="lockR/xlm-roberta-finance-multi-label-classification",
             framework="pt",
             top_k=None,
+            torch_dtype=torch.float16,
             # Transformers requires you to pass device with index
             device=torch.device("cuda:0"),
         )
 
-    def classify(self, sentence: str):
-        return self.classifier(sentence)
+    # Concurrent requests are grouped so the GPU sees one padded batch per forward pass.
+    @serve.batch(max_batch_size=32, batch_wait_timeout_s=0.01)
+    async def classify(self, sentences: List[str]):
+        return self.classifier(sentences, batch_size=len(sentences))
 
 
 entrypoint = APIIngress.bind(BertModel.bind())
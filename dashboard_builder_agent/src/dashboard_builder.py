@@ -1,5 +1,6 @@
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 import os
 from typing import List
@@ -40,15 +41,17 @@ PROMPT_PATH = SRC_DIR.parent / "data" / "prompts" / "build_md_report.md"
 with open(PROMPT_PATH, 'r', encoding='utf-8') as f:
     CHART_GEN_PROMPT = f.read()
 
+# Built once per process. The system prompt is passed as a message object rather
+# than a template string because it contains literal braces.
+CHAIN = ChatPromptTemplate.from_messages(
+    [SystemMessage(content=CHART_GEN_PROMPT), ("human", "{data}")]
+) | report_llm
+
 async def generate_chart(data: str) -> dict:
     """
     Asynchronously generates a chart
     """
-    messages = [
-        SystemMessage(content=CHART_GEN_PROMPT),
-        HumanMessage(content=data)  
-    ]
-    response: ChartJsonSchema = await report_llm.ainvoke(messages)
+    response: ChartJsonSchema = await CHAIN.ainvoke({"data": data})
     return response.dict() 
 
 if __name__ == '__main__':
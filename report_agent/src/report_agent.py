@@ -1,5 +1,6 @@
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 import os
 from typing import List
@@ -36,17 +37,19 @@ PROMPT_PATH = SRC_DIR.parent / "data" / "prompts" / "build_md_report.md"
 with open(PROMPT_PATH, 'r', encoding='utf-8') as f:
     REPORT_GEN_PROMPT = f.read()
 
+# Built once per process. The system prompt is passed as a message object rather
+# than a template string because it contains literal braces.
+CHAIN = ChatPromptTemplate.from_messages(
+    [SystemMessage(content=REPORT_GEN_PROMPT), ("human", "{data}")]
+) | report_llm
+
 async def generate_pdf_report(data: str) -> dict:
     """
     Asynchronously generates a structured report from chart data.
     Input `data` should be a JSON string of chart list.
     Returns a dict conforming to ReportJsonSchema.
     """
-    messages = [
-        SystemMessage(content=REPORT_GEN_PROMPT),
-        HumanMessage(content=data)  
-    ]
-    response: ReportJsonSchema = await report_llm.ainvoke(messages)
+    response: ReportJsonSchema = await CHAIN.ainvoke({"data": data})
     return response.dict() 
 
 if __name__ == '__main__':
@@ -0,0 +1,43 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services import auth, auth_cache
+
+
+def test_repeated_token_skips_user_lookup(client):
+    response = client.post(
+        "/auth/login", json={"email": "test@example.com", "password": "test"}
+    )
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_selects = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            user_selects.append(statement)
+
+    auth_cache.invalidate(token)
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/dashboard/widgets/", headers=headers).status_code == 200
+        assert client.get("/dashboard/widgets/", headers=headers).status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert len(user_selects) == 1
+
+
+def test_unknown_email_still_runs_bcrypt(client, monkeypatch):
+    calls = []
+    real_verify = auth.verify_password
+
+    def counting_verify(plain, hashed):
+        calls.append(hashed)
+        return real_verify(plain, hashed)
+
+    monkeypatch.setattr(auth, "verify_password", counting_verify)
+    response = client.post(
+        "/auth/login", json={"email": "nobody@example.com", "password": "test"}
+    )
+    assert response.status_code != 200
+    assert calls == [auth._dummy_hash()]
@@ -0,0 +1,103 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.db.session import SessionLocal
+from app.models.review import Review
+from app.services import dashboard_cache
+
+
+class _UnreachableRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise RedisConnectionError("redis is down")
+
+        return fail
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def delete(self, key):
+        self._ops.append(lambda: self._client.store.pop(key, None))
+
+    def set(self, key, value):
+        self._ops.append(lambda: self._client.set(key, value))
+
+    def execute(self):
+        return [op() for op in self._ops]
+
+
+def _add_review(text, score):
+    db = SessionLocal()
+    try:
+        db.add(Review(text=text, sentiment_score=score))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_overview_falls_back_to_database_when_redis_is_unreachable(client, monkeypatch):
+    monkeypatch.setattr(dashboard_cache.settings, "DASHBOARD_CACHE_TTL_SECONDS", 30)
+    monkeypatch.setattr(dashboard_cache, "_get_client", lambda: _UnreachableRedis())
+    _add_review("первый", 0.5)
+
+    db = SessionLocal()
+    try:
+        first = dashboard_cache.get_overview(db)
+        _add_review("второй", 1.0)
+        second = dashboard_cache.get_overview(db)
+    finally:
+        db.close()
+
+    assert second["total_reviews"] == first["total_reviews"] + 1
+    assert dashboard_cache.data_version() is None
+    dashboard_cache.invalidate_overview()
+
+
+def test_overview_is_cached_until_invalidated(client, monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(dashboard_cache.settings, "DASHBOARD_CACHE_TTL_SECONDS", 30)
+    monkeypatch.setattr(dashboard_cache, "_get_client", lambda: fake)
+
+    db = SessionLocal()
+    try:
+        cached = dashboard_cache.get_overview(db)
+        version = dashboard_cache.data_version()
+        assert version and dashboard_cache.data_version() == version
+        _add_review("третий", 0.0)
+        assert dashboard_cache.get_overview(db) == cached
+
+        dashboard_cache.invalidate_overview()
+        assert dashboard_cache.data_version() not in {None, version}
+        assert dashboard_cache.get_overview(db)["total_reviews"] == cached["total_reviews"] + 1
+    finally:
+        db.close()
+
+
+def test_version_does_not_repeat_after_redis_flush(client, monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(dashboard_cache, "_get_client", lambda: fake)
+
+    seen = {dashboard_cache.data_version()}
+    dashboard_cache.invalidate_overview()
+    seen.add(dashboard_cache.data_version())
+    fake.store.clear()
+    assert dashboard_cache.data_version() not in seen
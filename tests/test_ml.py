@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import httpx
+from openai import BadRequestError
+
+from app.services import ml
+from app.services.ml import _parse_payload
+
+
+def test_parse_payload_plain_json():
+    payload = _parse_payload('{"sentiment": "positive", "sentiment_score": 0.8}')
+    assert payload.sentiment == "positive"
+    assert payload.sentiment_score == 0.8
+
+
+def test_parse_payload_embedded_object_with_braces_in_strings():
+    content = (
+        "Вот результат:\n"
+        '{"sentiment": "negative", "summary": "клиент пишет {плохо}", '
+        '"highlights": ["скобка } внутри"]}\n'
+        "Дополнительный текст {не json}"
+    )
+    payload = _parse_payload(content)
+    assert payload.sentiment == "negative"
+    assert payload.summary == "клиент пишет {плохо}"
+    assert payload.highlights == ["скобка } внутри"]
+
+
+def test_parse_payload_trailing_commas():
+    content = '```json\n{"sentiment": "neutral", "highlights": ["a", "b",],}\n```'
+    payload = _parse_payload(content)
+    assert payload.sentiment == "neutral"
+    assert payload.highlights == ["a", "b"]
+
+
+def test_analyze_text_does_not_retry_client_errors(monkeypatch):
+    calls = []
+
+    async def fake_completion(**kwargs):
+        calls.append(kwargs)
+        request = httpx.Request("POST", "https://example.com/chat/completions")
+        response = httpx.Response(400, request=request)
+        raise BadRequestError("bad request", response=response, body=None)
+
+    monkeypatch.setattr(ml.settings, "FOUNDATION_API_KEY", "test-key")
+    monkeypatch.setattr(ml.settings, "FOUNDATION_CHAT_RETRIES", 3)
+    monkeypatch.setattr(ml, "create_chat_completion", fake_completion)
+
+    result = asyncio.run(ml.analyze_text_async("хороший банк", embedding=[0.1]))
+
+    assert len(calls) == 1
+    assert result["sentiment"] in {"positive", "negative", "neutral"}
+    assert result["embedding"] == [0.1]
+
+
+def test_analyze_text_returns_cached_payload(monkeypatch):
+    async def fail_completion(**kwargs):
+        raise AssertionError("cached analysis must not call the LLM")
+
+    cached = {"sentiment": "positive", "sentiment_score": 0.9, "summary": "ok", "highlights": []}
+    monkeypatch.setattr(ml.settings, "FOUNDATION_API_KEY", "test-key")
+    monkeypatch.setattr(ml.llm_cache, "get_json", lambda key: cached)
+    monkeypatch.setattr(ml, "create_chat_completion", fail_completion)
+
+    result = asyncio.run(ml.analyze_text_async("хороший банк", embedding=[0.1]))
+
+    assert result["sentiment"] == "positive"
+    assert result["sentiment_score"] == 0.9
+    assert result["embedding"] == [0.1]
+
+
+def test_analyze_text_cache_calls_run_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    cache_threads = []
+
+    def fake_get_json(key):
+        cache_threads.append(threading.get_ident())
+        return None
+
+    def fake_set_json(key, value):
+        cache_threads.append(threading.get_ident())
+
+    async def fake_completion(**kwargs):
+        message = SimpleNamespace(content='{"sentiment": "neutral", "sentiment_score": 0.5}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(ml.settings, "FOUNDATION_API_KEY", "test-key")
+    monkeypatch.setattr(ml.llm_cache, "get_json", fake_get_json)
+    monkeypatch.setattr(ml.llm_cache, "set_json", fake_set_json)
+    monkeypatch.setattr(ml, "create_chat_completion", fake_completion)
+
+    result = asyncio.run(ml.analyze_text_async("обычный банк", embedding=[0.1]))
+
+    assert result["sentiment"] == "neutral"
+    assert len(cache_threads) == 2
+    assert loop_thread not in cache_threads
@@ -0,0 +1,98 @@
+import orjson
+
+from app.schemas.parser import ReviewRow
+from app.services import review_parser
+from app.services.review_parser import REVIEW_CSV_HEADERS, BankiRuParser, SravniParser
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload=None, text=""):
+        self.content = orjson.dumps(payload) if payload is not None else b""
+        self.text = text
+
+
+def test_sravni_rows_keep_original_types(tmp_path, monkeypatch):
+    parser = SravniParser(tmp_path)
+    item = {
+        "id": 123,
+        "date": "2024-01-01T10:00:00Z",
+        "authorName": "Иван",
+        "title": "Хорошо",
+        "text": "Быстро открыли карту",
+        "rating": 5,
+        "hasCompanyResponse": True,
+    }
+    monkeypatch.setattr(
+        parser._session, "get", lambda *args, **kwargs: _FakeResponse({"items": [item]})
+    )
+
+    result = parser.parse_gazprombank_reviews(
+        page_size=20, max_pages=1, delay_range=(0.0, 0.0), include_rows=True
+    )
+
+    assert len(result.rows) == 1
+    row = result.rows[0]
+    assert list(row) == list(REVIEW_CSV_HEADERS)
+    assert row["rating"] == 5
+    assert row["review_id"] == 123
+    assert row["is_bank_ans"] is True
+    ReviewRow(**row)
+    assert result.csv_path.read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_sravni_rows_omitted_without_include_rows(tmp_path, monkeypatch):
+    parser = SravniParser(tmp_path)
+    monkeypatch.setattr(
+        parser._session,
+        "get",
+        lambda *args, **kwargs: _FakeResponse({"items": [{"id": 1, "rating": 4}]}),
+    )
+
+    result = parser.parse_gazprombank_reviews(max_pages=1, delay_range=(0.0, 0.0))
+
+    assert result.rows == []
+    assert result.rows_written == 1
+
+
+def test_banki_rows_keep_original_types(tmp_path, monkeypatch):
+    parser = BankiRuParser(tmp_path)
+    item = {
+        "id": 456,
+        "dateCreate": "2024-01-02 12:00:00",
+        "title": "Плохо",
+        "text": "<p>Долго ждал</p>",
+        "grade": 2,
+        "isCountable": True,
+    }
+    monkeypatch.setattr(parser, "_fetch_banki_page", lambda *args: _FakeResponse())
+    monkeypatch.setattr(
+        parser, "_extract_page_payload", lambda html: ([item], False, [{"author": "Пётр"}], [])
+    )
+
+    result = parser.parse_reviews(max_pages=1, delay_range=(0.0, 0.0), include_rows=True)
+
+    assert len(result.rows) == 1
+    row = result.rows[0]
+    assert list(row) == list(REVIEW_CSV_HEADERS)
+    assert row["rating"] == 2
+    assert row["review_id"] == 456
+    assert row["is_bank_ans"] is False
+    assert row["review_text"] == "Долго ждал"
+    ReviewRow(**row)
+
+
+def test_parser_service_passes_user_agent_randomization(monkeypatch):
+    class FakeUserAgent:
+        random = "FakeAgent/1.0"
+
+    monkeypatch.setattr(review_parser, "_user_agent_factory", lambda: FakeUserAgent)
+
+    randomized = review_parser.ParserService(randomize_user_agent=True)
+    assert randomized._sravni_parser._build_headers()["User-Agent"] == "FakeAgent/1.0"
+    assert randomized._banki_parser._build_headers()["User-Agent"] == "FakeAgent/1.0"
+
+    monkeypatch.setattr(review_parser.settings, "PARSER_RANDOM_USER_AGENT", False)
+    default = review_parser.ParserService()
+    assert default._sravni_parser._build_headers()["User-Agent"] != "FakeAgent/1.0"
@@ -1,5 +1,13 @@
+import asyncio
 import json
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.review import Review
+from app.services import reviews as reviews_service
+
 
 def get_token(client):
     response = client.post(
@@ -40,3 +48,41 @@ def test_timeseries_endpoint(client):
         "/reviews/timeseries", headers={"Authorization": f"Bearer {token}"}
     )
     assert resp.status_code == 200
+
+
+def test_import_mixed_analyses_uses_one_insert(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    async def fake_process_reviews(texts):
+        # Alternate LLM results with fallbacks that carry no embedding or highlights.
+        return [
+            {"sentiment": "positive", "sentiment_score": 0.9, "summary": "ok",
+             "embedding": [0.1, 0.2], "highlights": ["быстро"]}
+            if index % 2 == 0
+            else {"sentiment": "neutral", "sentiment_score": 0.5, "summary": "",
+                  "embedding": None, "highlights": []}
+            for index, _ in enumerate(texts)
+        ]
+
+    monkeypatch.setattr(reviews_service, "process_reviews", fake_process_reviews)
+    monkeypatch.setattr(reviews_service, "invalidate_overview", lambda: None)
+    records = [{"product": "card", "text": f"review {index}"} for index in range(7)]
+
+    db = sessionmaker(bind=engine)()
+    try:
+        imported = asyncio.run(reviews_service.import_reviews_async(db, records))
+        assert len(statements) == 1
+        assert [review.text for review in imported] == [record["text"] for record in records]
+        assert [review.insights for review in imported[:2]] == [{"highlights": ["быстро"]}, None]
+        assert db.query(Review).filter(Review.embedding.is_(None)).count() == 3
+        assert db.query(Review).filter(Review.insights.is_(None)).count() == 3
+    finally:
+        db.close()
+        engine.dispose()
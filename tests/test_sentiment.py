@@ -0,0 +1,59 @@
+from app.db.session import SessionLocal
+from app.models.review import Review
+from app.tasks import sentiment
+
+
+def test_analyze_reviews_updates_rows_in_bulk(client, monkeypatch):
+    db = SessionLocal()
+    try:
+        kept = Review(
+            product="card",
+            text="хороший банк",
+            embedding=[0.5],
+            insights={"highlights": ["старое"]},
+        )
+        fresh = Review(product="deposit", text="плохой банк")
+        db.add_all([kept, fresh])
+        db.commit()
+        ids = [kept.id, fresh.id]
+    finally:
+        db.close()
+
+    async def fake_process_reviews(texts):
+        texts = list(texts)
+        return [
+            {"sentiment": "positive", "sentiment_score": 0.9, "summary": "ok",
+             "embedding": None, "highlights": []}
+            if text == "хороший банк"
+            else {"sentiment": "negative", "sentiment_score": -0.7, "summary": "плохо",
+                  "embedding": [0.1, 0.2], "highlights": ["долго", "дорого"]}
+            for text in texts
+        ]
+
+    invalidations = []
+    monkeypatch.setattr(sentiment, "process_reviews", fake_process_reviews)
+    monkeypatch.setattr(sentiment, "invalidate_overview", lambda: invalidations.append(True))
+
+    assert sentiment._analyze_reviews(ids + [10_000]) == 2
+    assert invalidations == [True]
+
+    db = SessionLocal()
+    try:
+        kept, fresh = (db.get(Review, review_id) for review_id in ids)
+        assert (kept.sentiment, kept.sentiment_score) == ("positive", 0.9)
+        # A fallback analysis must not wipe stored JSON columns.
+        assert kept.embedding == [0.5]
+        assert kept.insights == {"highlights": ["старое"]}
+        assert (fresh.sentiment, fresh.sentiment_summary) == ("negative", "плохо")
+        assert fresh.embedding == [0.1, 0.2]
+        assert fresh.insights == {"highlights": ["долго", "дорого"]}
+    finally:
+        db.close()
+
+
+def test_analyze_reviews_missing_ids(client, monkeypatch):
+    async def fail_process_reviews(texts):
+        raise AssertionError("nothing to analyze")
+
+    monkeypatch.setattr(sentiment, "process_reviews", fail_process_reviews)
+    assert sentiment._analyze_reviews([123_456]) == 0
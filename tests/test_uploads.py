@@ -0,0 +1,62 @@
+import io
+import tempfile
+
+import pytest
+
+from app.services.reviews import pack_records, unpack_records
+from app.services.uploads import UnsupportedUploadError, parse_review_upload
+
+
+def test_parse_csv_upload():
+    body = "product,text,date\r\ncard,\"хорошо, быстро\",2023-01-01T00:00:00\r\n".encode()
+    records = parse_review_upload("reviews.csv", io.BytesIO(body))
+    assert records == [
+        {"product": "card", "text": "хорошо, быстро", "date": "2023-01-01T00:00:00"}
+    ]
+
+
+def test_parse_json_upload_single_object():
+    records = parse_review_upload("reviews.json", io.BytesIO(b'{"text": "ok"}'))
+    assert records == [{"text": "ok"}]
+
+
+def test_parse_unsupported_upload():
+    with pytest.raises(UnsupportedUploadError):
+        parse_review_upload("reviews.txt", io.BytesIO(b""))
+
+
+def test_pack_records_round_trip():
+    records = [
+        {"product": "card", "text": "ok", "date": "2023-01-01", "extra": "x"},
+        {"text": "no product"},
+    ]
+    columns = pack_records(records)
+    assert set(columns) == {"product", "text", "date"}
+    assert unpack_records(columns) == [
+        {"product": "card", "text": "ok", "date": "2023-01-01"},
+        {"product": None, "text": "no product", "date": None},
+    ]
+
+
+def test_parse_csv_upload_from_read_only_stream():
+    # Python 3.10's SpooledTemporaryFile has read() but no readable()/seekable().
+    class ReadOnly:
+        def __init__(self, body):
+            self._body = io.BytesIO(body)
+
+        def read(self, size=-1):
+            return self._body.read(size)
+
+    body = "text,product\r\nбыстро,card\r\n".encode()
+    upload = ReadOnly(body)
+    assert parse_review_upload("reviews.csv", upload) == [{"text": "быстро", "product": "card"}]
+    assert not upload._body.closed
+
+
+def test_parse_csv_upload_keeps_spooled_file_open():
+    upload = tempfile.SpooledTemporaryFile()
+    upload.write(b"text\r\nok\r\n")
+    upload.seek(0)
+    assert parse_review_upload("reviews.csv", upload) == [{"text": "ok"}]
+    assert not upload.closed
+    upload.close()
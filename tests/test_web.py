@@ -0,0 +1,75 @@
+from starlette.requests import Request
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.models.widget import Widget
+from app.web import routes
+
+
+def _request(token):
+    return Request({"type": "http", "headers": [(b"cookie", f"access_token={token}".encode())]})
+
+
+def _etag(token):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "test@example.com").one()
+        return routes._dashboard_etag(_request(token), db, user, routes._user_widgets(db, user))
+    finally:
+        db.close()
+
+
+def test_dashboard_revalidation_returns_304(client, monkeypatch):
+    monkeypatch.setattr(routes, "data_version", lambda: "7")
+    token = create_access_token({"sub": "test@example.com"})
+    etag = _etag(token)
+    client.cookies.set("access_token", token)
+    try:
+        response = client.get("/", headers={"If-None-Match": etag})
+    finally:
+        client.cookies.clear()
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_dashboard_etag_changes_with_data_version(client, monkeypatch):
+    token = create_access_token({"sub": "test@example.com"})
+    monkeypatch.setattr(routes, "data_version", lambda: "7")
+    before = _etag(token)
+    monkeypatch.setattr(routes, "data_version", lambda: "8")
+    assert _etag(token) != before
+
+    monkeypatch.setattr(routes, "data_version", lambda: None)
+    assert _etag(token) is None
+
+
+def test_dashboard_etag_changes_with_widgets(client, monkeypatch):
+    monkeypatch.setattr(routes, "data_version", lambda: "7")
+    token = create_access_token({"sub": "test@example.com"})
+    before = _etag(token)
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "test@example.com").one()
+        widget = Widget(owner_id=user.id, title="Total", metric="total_reviews")
+        db.add(widget)
+        db.commit()
+        added = _etag(token)
+        assert added != before
+
+        widget.title = "Renamed"
+        db.commit()
+        assert _etag(token) not in {before, added}
+    finally:
+        db.close()
+
+
+def test_dashboard_etag_changes_with_build(client, monkeypatch):
+    monkeypatch.setattr(routes, "data_version", lambda: "7")
+    token = create_access_token({"sub": "test@example.com"})
+    before = _etag(token)
+    monkeypatch.setattr(routes, "_DASHBOARD_BUILD_ID", "next-deploy")
+    assert _etag(token) != before
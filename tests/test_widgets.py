@@ -1,4 +1,22 @@
 import json
+from datetime import datetime
+from typing import get_args
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.functions import day_bucket
+from app.db.session import SessionLocal
+from app.models.review import Review
+from app.models.widget import Widget
+from app.schemas.widget import MetricType
+from app.services.widgets import (
+    METRIC_MAP,
+    compute_widget_value,
+    compute_widget_values,
+    timeseries_all,
+)
 
 
 def get_token(client):
@@ -47,3 +65,90 @@ def test_widget_crud(client):
     list_resp = client.get("/dashboard/widgets/", headers=headers)
     assert list_resp.status_code == 200
     assert all(w["id"] != widget_id for w in list_resp.json())
+
+
+def test_widget_list_query_count_is_flat(client):
+    token = get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def list_query_count():
+        statements.clear()
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/dashboard/widgets/", headers=headers)
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        return len(statements)
+
+    for metric in ("total_reviews", "positive_share"):
+        client.post("/dashboard/widgets/", json={"title": metric, "metric": metric}, headers=headers)
+    baseline = list_query_count()
+
+    for metric in ("negative_reviews", "average_sentiment", "unlabeled_reviews"):
+        client.post("/dashboard/widgets/", json={"title": metric, "metric": metric}, headers=headers)
+    assert list_query_count() == baseline
+
+
+def test_metric_map_covers_metric_type():
+    assert set(METRIC_MAP) == set(get_args(MetricType))
+
+
+def test_create_widget_rejects_unknown_metric(client):
+    token = get_token(client)
+    response = client.post(
+        "/dashboard/widgets/",
+        json={"title": "Bogus", "metric": "bogus_metric"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
+
+
+def test_metric_values_agree_across_helpers(client):
+    db = SessionLocal()
+    try:
+        db.query(Review).delete()
+        samples = [(9, "positive", 0.8), (12, "negative", -0.4), (18, "positive", 0.5), (20, None, None)]
+        db.add_all(
+            Review(text="r", date=datetime(2024, 3, 1, hour), sentiment=label, sentiment_score=score)
+            for hour, label, score in samples
+        )
+        db.commit()
+
+        widgets = [Widget(id=index, metric=metric) for index, metric in enumerate(METRIC_MAP)]
+        bulk = compute_widget_values(widgets, db)
+        series = timeseries_all(db)
+        for widget in widgets:
+            single = compute_widget_value(widget, db)
+            assert bulk[widget.id] == single, widget.metric
+            assert [point["value"] for point in series[widget.metric]] == [single], widget.metric
+        assert bulk[widgets[list(METRIC_MAP).index("positive_share")].id] == 50.0
+    finally:
+        db.query(Review).delete()
+        db.commit()
+        db.close()
+
+
+def test_unknown_metric_values_fall_back_to_zero(client):
+    db = SessionLocal()
+    try:
+        widget = Widget(id=1, metric="bogus_metric")
+        assert compute_widget_value(widget, db) == 0.0
+        assert compute_widget_values([widget], db) == {1: 0.0}
+    finally:
+        db.close()
+
+
+def test_day_bucket_uses_engine_dialect_without_get_bind(monkeypatch):
+    db = Session()
+
+    def fail_get_bind(*args, **kwargs):
+        raise AssertionError("day_bucket must not resolve the bind per call")
+
+    monkeypatch.setattr(db, "get_bind", fail_get_bind)
+    assert day_bucket(db, Review.date).name == "date"
+    db.close()